@@ -121,7 +121,8 @@ class ConversationMemory:
         project_id: Optional[str] = None,
         project_name: Optional[str] = None,
         epic_id: Optional[int] = None,
-        scope: str = "specific"
+        scope: str = "specific",
+        siblings: Optional[List[int]] = None
     ) -> None:
         """
         Update project context for a conversation.
@@ -132,6 +133,7 @@ class ConversationMemory:
             project_name: Project name (Epic name)
             epic_id: Epic work item ID
             scope: Project scope ('specific', 'all', 'default')
+            siblings: Optional Epic IDs the user is likely to ask about next
         """
         if conversation_id not in self._storage:
             self._storage[conversation_id] = []
@@ -141,6 +143,7 @@ class ConversationMemory:
             "project_name": project_name,
             "epic_id": epic_id,
             "scope": scope,
+            "siblings": siblings or [],
             "updated_at": datetime.now().isoformat()
         }
         
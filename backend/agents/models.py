@@ -18,7 +18,7 @@ def get_intent_categories():
 def get_category_info():
     """Get category descriptions dynamically."""
     from backend.intents import IntentRegistry
-    intents = IntentRegistry.get_all()
+    intents = IntentRegistry.get_all_view()
     return {
         category: f"{metadata.name} - {metadata.description}"
         for category, metadata in intents.items()
@@ -51,10 +51,19 @@ class AzureConfig:
         #e4005fd0-7b95-4391-8486-c4b21c935b2e b50492f0-02ea-47c0-a987-f5404c7e2f89
         self.devops_project_id = os.getenv("AZURE_PROJECT_ID", "b50492f0-02ea-47c0-a987-f5404c7e2f89")
         self.devops_project_name = os.getenv("AZURE_PROJECT_NAME", "Next.IA")#
-        
+        self.devops_area_path = os.getenv("AZURE_DEVOPS_AREA_PATH", "HUB GenAI\\Projeto DELTA")
+
         # Validate required credentials
         self._validate_credentials()
         
+        # DevOps headers and base URL never change after startup, build them once
+        self._devops_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.devops_token}",
+        }
+        # Ensure no double slashes by stripping trailing slash from base URL
+        self._devops_base_url = f"{self.devops_url.rstrip('/')}/{self.devops_project_id}"
+        
         self._initialized = True
     
     def _validate_credentials(self):
@@ -100,11 +109,8 @@ class AzureConfig:
         return self._instructor_client
     
     def get_devops_headers(self) -> Dict[str, str]:
-        """Get headers for Azure DevOps API requests."""
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.devops_token}",
-        }
+        """Get headers for Azure DevOps API requests (shared dict, do not mutate)."""
+        return self._devops_headers
     
     def get_devops_url(self, project_id: Optional[str] = None) -> str:
         """
@@ -116,14 +122,8 @@ class AzureConfig:
         Returns:
             Base URL for Azure DevOps API
         """
-        if not self.devops_url:
-            raise ValueError("Azure DevOps URL not configured")
-            
-        pid = self.devops_project_id
         #pid = project_id or self.devops_project_id
-        # Ensure no double slashes by stripping trailing slash from base URL
-        base_url = self.devops_url.rstrip('/')
-        return f"{base_url}/{pid}"
+        return self._devops_base_url
     
     def create_chat_completion(
         self,
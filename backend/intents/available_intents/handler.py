@@ -36,7 +36,7 @@ class AvailableActionsService(BaseService):
         from backend.intents.registry import IntentRegistry
         from backend.intents.not_implemented import create_not_implemented_handler
         
-        all_intents = IntentRegistry.get_all()
+        all_intents = IntentRegistry.get_all_view()
         
         implemented_intents = {
             category: metadata 
@@ -4,7 +4,9 @@ All intent extractors should inherit from this class.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, TypeVar, Generic
+from functools import lru_cache
+from string import Formatter
+from typing import Optional, Dict, Tuple, TypeVar, Generic
 
 from backend.config import get_azure_config
 from backend.config.logging import chat_logger
@@ -14,6 +16,20 @@ from .models import BaseQueryParams
 TParams = TypeVar('TParams', bound=BaseQueryParams)
 
 
+@lru_cache(maxsize=None)
+def _parse_prompt(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Split a str.format template into (literal text, field name) pairs, once per template.
+    Only plain "{name}" placeholders are supported (no format specs or conversions).
+    """
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported placeholder in prompt: {{{field}!{conversion}:{spec}}}")
+        parts.append((literal, field))
+    return tuple(parts)
+
+
 class BaseExtractor(ABC, Generic[TParams]):
     """
     Abstract base class for parameter extractors.
@@ -94,6 +110,22 @@ class BaseExtractor(ABC, Generic[TParams]):
         """
         pass
     
+    def _render_prompt(self, **values: str) -> str:
+        """
+        Fill EXTRACTION_PROMPT placeholders by plain concatenation.
+        The template is parsed once and cached, so per-call work is a join.
+        
+        Args:
+            **values: Value for each placeholder in EXTRACTION_PROMPT
+            
+        Returns:
+            Rendered prompt (same text as EXTRACTION_PROMPT.format(**values))
+        """
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in _parse_prompt(self.EXTRACTION_PROMPT)
+        )
+    
     def _format_context(self, context: Optional[Dict]) -> str:
         """
         Helper method to format conversation context.
@@ -106,10 +106,11 @@ class BaseIntentHandler:
             if self.logger and context:
                 self.logger.info(f"Retrieved conversation context: {len(context)} items")
             
-            # 2. Extract parameters from query
+            # 2. Extract parameters from query (services may start fetching meanwhile)
             if self.logger:
                 self.logger.info("Extracting parameters...")
             
+            self.service.start_prefetch()
             params = await self.extractor.extract_params(query, context)
             
             # 3. Enrich params with project_id from context
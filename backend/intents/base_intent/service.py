@@ -3,11 +3,18 @@ Base service for querying data from external sources.
 All intent services should inherit from this class.
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, TypeVar, Generic
+from typing import Any, ClassVar, Dict, Optional, Tuple, TypeVar, Generic
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
+try:
+    import orjson
+except ImportError:  # optional faster JSON decoder
+    orjson = None
+
 from backend.config import get_azure_config
 from backend.config.logging import chat_logger
 from .models import BaseQueryParams, BaseResponse
@@ -16,6 +23,16 @@ from .models import BaseQueryParams, BaseResponse
 TParams = TypeVar('TParams', bound=BaseQueryParams)
 TResponse = TypeVar('TResponse', bound=BaseResponse)
 
+# Maximum length for user-provided values interpolated into WIQL
+WIQL_VALUE_MAX_LENGTH = 100
+
+# Maximum Azure DevOps requests in flight per process, across all services.
+# Requests run in worker threads (asyncio.to_thread), so this is a thread semaphore;
+# it keeps concurrent batch fetches under the DevOps rate limits (429s are then
+# retried by the session, honoring Retry-After)
+MAX_CONCURRENT_DEVOPS_REQUESTS = 10
+_devops_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_DEVOPS_REQUESTS)
+
 
 class BaseService(ABC, Generic[TParams, TResponse]):
     """
@@ -32,6 +49,12 @@ class BaseService(ABC, Generic[TParams, TResponse]):
     DEFAULT_TIMEOUT = 30  # seconds
     DEFAULT_RETRY_TOTAL = 3
     DEFAULT_RETRY_BACKOFF_FACTOR = 0.5
+    POOL_MAXSIZE = 32  # keep-alive connections kept per host
+    
+    # HTTP sessions shared across chat requests and across services, so the
+    # TCP/TLS connections to Azure DevOps are reused; services only get a
+    # separate pool when they customize the session (see _session_key)
+    _shared_sessions: ClassVar[Dict[Tuple[Any, ...], requests.Session]] = {}
     
     def __init__(self, session_id: Optional[str] = None, intent_name: Optional[str] = None):
         """
@@ -55,7 +78,41 @@ class BaseService(ABC, Generic[TParams, TResponse]):
         else:
             self.logger = None
         
-        self._session = self._create_session()
+        self._session = self._get_shared_session()
+    
+    def _get_shared_session(self) -> requests.Session:
+        """
+        Get the pooled HTTP session for this service's configuration, creating it on first use.
+        
+        Returns:
+            Session shared by all services with the same session configuration
+        """
+        key = self._session_key()
+        session = BaseService._shared_sessions.get(key)
+        if session is None:
+            session = self._create_session()
+            BaseService._shared_sessions[key] = session
+        return session
+    
+    def _session_key(self) -> Tuple[Any, ...]:
+        """
+        Identify the session configuration: services that neither override
+        _create_session nor change the retry/pool settings share one session.
+        """
+        cls = type(self)
+        return (
+            cls._create_session,
+            cls.DEFAULT_RETRY_TOTAL,
+            cls.DEFAULT_RETRY_BACKOFF_FACTOR,
+            cls.POOL_MAXSIZE,
+        )
+    
+    @classmethod
+    def close_shared_sessions(cls) -> None:
+        """Close all pooled HTTP sessions (called on application shutdown)."""
+        for session in BaseService._shared_sessions.values():
+            session.close()
+        BaseService._shared_sessions.clear()
     
     def _create_session(self) -> requests.Session:
         """
@@ -69,10 +126,11 @@ class BaseService(ABC, Generic[TParams, TResponse]):
             total=self.DEFAULT_RETRY_TOTAL,
             backoff_factor=self.DEFAULT_RETRY_BACKOFF_FACTOR,
             status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
+            respect_retry_after_header=True,  # DevOps sends Retry-After when throttling
             allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS", "TRACE"]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=self.POOL_MAXSIZE)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -108,12 +166,13 @@ class BaseService(ABC, Generic[TParams, TResponse]):
             self.logger.info(f"Making {method} request to {url} (timeout: {timeout}s)")
         
         try:
-            response = self._session.request(
-                method=method,
-                url=url,
-                timeout=timeout,
-                **kwargs
-            )
+            with _devops_request_slots:
+                response = self._session.request(
+                    method=method,
+                    url=url,
+                    timeout=timeout,
+                    **kwargs
+                )
             response.raise_for_status()
             
             if self.logger:
@@ -152,6 +211,33 @@ class BaseService(ABC, Generic[TParams, TResponse]):
                 self.logger.error(f"Request failed: {method} {url} - {str(e)}", exc_info=True)
             raise Exception(f"Request failed for {url}: {str(e)}") from e
     
+    @staticmethod
+    def _decode_json(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body, using orjson when it is installed.
+        Work item payloads can be large and decoding runs on the request path.
+        
+        Args:
+            response: Successful HTTP response
+            
+        Returns:
+            Decoded JSON data
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    def start_prefetch(self) -> Optional[asyncio.Task]:
+        """
+        Optional hook called by the handler before parameter extraction.
+        Services whose data does not depend on the extracted parameters can
+        start fetching it here, overlapping the request with the LLM call.
+        
+        Returns:
+            The background task, or None if the service does not prefetch
+        """
+        return None
+    
     @abstractmethod
     async def query_data(self, params: TParams) -> TResponse:
         """
@@ -194,3 +280,23 @@ class BaseService(ABC, Generic[TParams, TResponse]):
             WIQL query string
         """
         raise NotImplementedError("Subclass must implement _build_wiql_query if using WIQL")
+
+    @staticmethod
+    def _escape_wiql_value(value: Optional[str], max_length: int = WIQL_VALUE_MAX_LENGTH) -> Optional[str]:
+        """
+        Escape a user-provided value for use inside a WIQL string literal.
+        Doubles single quotes and truncates overly long values.
+
+        Args:
+            value: Raw value (e.g. extracted by the LLM)
+            max_length: Maximum number of characters kept
+
+        Returns:
+            Escaped value, or None if empty
+        """
+        if value is None:
+            return None
+        value = str(value).strip()[:max_length]
+        if not value:
+            return None
+        return value.replace("'", "''")
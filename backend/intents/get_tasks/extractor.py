@@ -60,10 +60,10 @@ class GetTasksExtractor(BaseExtractor[GetTasksQuery]):
         if context and context.get("last_params"):
             context_str = f"Previous query parameters: {context['last_params']}"
             if self.logger:
-                self.logger.info(f"Using conversation context: {context.get('last_query', 'N/A')}"[:150])
+                self.logger.info("Using conversation context: %.122s", context.get('last_query', 'N/A'))
         
         # Create extraction prompt
-        prompt = self.EXTRACTION_PROMPT.format(
+        prompt = self._render_prompt(
             context=context_str,
             query=query
         )
@@ -94,7 +94,7 @@ class GetTasksExtractor(BaseExtractor[GetTasksQuery]):
             )
             
             if self.logger:
-                self.logger.info(f"Parameters extracted successfully: {params.model_dump()}")
+                self.logger.info("Parameters extracted successfully: %s", params)
             
             return params
             
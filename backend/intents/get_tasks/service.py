@@ -2,15 +2,100 @@
 Service for querying tasks from Azure DevOps.
 """
 
-from typing import List, Dict, Any
+import asyncio
+import threading
+import time
+from typing import ClassVar, List, Dict, Any, Optional, Set, Tuple
 
 from backend.intents.base_intent import BaseService
 from .models import GetTasksQuery, GetTasksResponse, TaskItem
 
 
+# Fields returned by the tasks WIQL queries
+_SELECT_FIELDS = ",\n    ".join(f"[{field}]" for field in (
+    "System.Id",
+    "System.WorkItemType",
+    "System.Title",
+    "System.State",
+    "Microsoft.VSTS.Common.ValueArea",
+    "System.Tags",
+    "Custom.EstimatedHours",
+    "Custom.FullHours",
+    "System.AssignedTo",
+    "Custom.AreaName",
+    "Custom.ClientFace",
+    "Custom.ProductOwner",
+    "System.Description",
+    "Microsoft.VSTS.Scheduling.RemainingWork",
+    "System.IterationPath",
+    "System.AreaPath",
+    "Microsoft.VSTS.Common.StackRank",
+))
+
+# Fields needed to list the people assigned to tasks
+_ASSIGNEE_FIELDS = ("System.WorkItemType", "System.AssignedTo")
+
+# Valid task states accepted in WIQL filters (lowercase -> canonical)
+_ALLOWED_STATES = {
+    state.lower(): state
+    for state in ("New", "Active", "Blocked", "Closed", "Resolved", "In Progress", "Completed")
+}
+
+# Summary message templates keyed by (count bucket, scope)
+_MSG_TEMPLATES = {
+    ("zero", "all"): "Nenhuma tarefa encontrada com os critérios especificados em todos os projetos do DELTA.",
+    ("zero", "epic"): "Nenhuma tarefa encontrada com os critérios especificados no {project}.",
+    ("one", "all"): "Encontrada 1 tarefa em todos os projetos do DELTA.",
+    ("one", "epic"): "Encontrada 1 tarefa do {project}.",
+    ("many", "all"): "Encontradas {n} tarefas em todos os projetos do DELTA.",
+    ("many", "epic"): "Encontradas {n} tarefas do {project}.",
+}
+
+# Process-local cache of work item details: (project_id, ids) -> (stored_at, items).
+# Entries are not revalidated against System.Rev, so an edit made in DevOps can take
+# up to _DETAILS_CACHE_TTL seconds to show up; keep the window short
+_DETAILS_CACHE: Dict[Tuple[str, Tuple[int, ...]], Tuple[float, List[Dict[str, Any]]]] = {}
+_DETAILS_CACHE_TTL = 30  # seconds
+_DETAILS_CACHE_MAXSIZE = 256
+
+# Sibling Epics prefetched into _DETAILS_CACHE: (project_id, epic_id) -> prefetched_at.
+# While an entry is younger than the cache TTL, its prefetch is not repeated
+_SIBLING_PREFETCHED: Dict[Tuple[str, int], float] = {}
+
+# Both dicts are used from the event loop and from asyncio.to_thread workers
+_CACHE_LOCK = threading.Lock()
+
+
+def _details_cache_get(key: Tuple[str, Tuple[int, ...]]) -> Optional[List[Dict[str, Any]]]:
+    """Return cached work item details if present and not expired."""
+    with _CACHE_LOCK:
+        entry = _DETAILS_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, items = entry
+        if time.monotonic() - stored_at > _DETAILS_CACHE_TTL:
+            _DETAILS_CACHE.pop(key, None)
+            return None
+        return items
+
+
+def _details_cache_put(key: Tuple[str, Tuple[int, ...]], items: List[Dict[str, Any]]) -> None:
+    """Store work item details, evicting the oldest entry when full."""
+    with _CACHE_LOCK:
+        _DETAILS_CACHE.pop(key, None)
+        if len(_DETAILS_CACHE) >= _DETAILS_CACHE_MAXSIZE:
+            _DETAILS_CACHE.pop(next(iter(_DETAILS_CACHE)))
+        _DETAILS_CACHE[key] = (time.monotonic(), items)
+
+
 class GetTasksService(BaseService[GetTasksQuery, GetTasksResponse]):
     """Service to query tasks from Azure DevOps API."""
     
+    WORK_ITEMS_BATCH_SIZE = 200  # Azure DevOps limit of ids per work items request
+    
+    # Keep references to prefetch tasks so they are not garbage collected mid-flight
+    _background_tasks: ClassVar[Set[asyncio.Task]] = set()
+    
     async def query_data(self, params: GetTasksQuery) -> GetTasksResponse:
         """
         Query tasks from Azure DevOps.
@@ -34,34 +119,18 @@ class GetTasksService(BaseService[GetTasksQuery, GetTasksResponse]):
         url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
         
         try:
-            # Use base service method with timeout and retry
-            response = self.make_request(
+            # Base service method with timeout and retry; blocking, so run off the event loop
+            response = await asyncio.to_thread(
+                self.make_request,
                 method="POST",
                 url=url,
                 headers=self.azure_config.get_devops_headers(),
                 json={"query": wiql_query}
             )
             
-            data = response.json()
+            data = self._decode_json(response)
             
-            # Handle both simple and hierarchical query responses
-            work_item_ids = []
-            relations = data.get("workItemRelations", [])
-            
-            if relations:
-                # Hierarchical query response (Epic → Tasks structure)
-                work_item_ids_set = set()
-                for relation in relations:
-                    source = relation.get("source")
-                    target = relation.get("target") 
-                    if source and source.get("id"):
-                        work_item_ids_set.add(source.get("id"))
-                    if target and target.get("id"):
-                        work_item_ids_set.add(target.get("id"))
-                work_item_ids = list(work_item_ids_set)
-            else:
-                # Simple query response (direct work items)
-                work_item_ids = [item["id"] for item in data.get("workItems", [])]
+            work_item_ids = self._extract_work_item_ids(data)
             
             if not work_item_ids:
                 return GetTasksResponse(
@@ -80,18 +149,71 @@ class GetTasksService(BaseService[GetTasksQuery, GetTasksResponse]):
             work_items = await self._get_work_item_details(project_id, work_item_ids)
             
             # Process and filter work items
-            return self._process_work_items(work_items, params)
+            result = self._process_work_items(work_items, params)
+            
+            # Warm the cache for the Epics the user is likely to ask about next
+            self._schedule_sibling_prefetch(project_id)
+            
+            return result
             
         except Exception as e:
             # Error already handled by base service with detailed message
             raise
     
+    async def query_assignees(self) -> List[str]:
+        """
+        List the distinct people assigned to Tasks in the current scope
+        (the Epic in session memory, or the whole area).
+        Runs the same WIQL as query_data but only requests the type and
+        assignee fields of each work item, instead of the full task details.
+        
+        Returns:
+            Assignee display names, in first-seen order
+        """
+        project_id = self.azure_config.devops_project_id
+        url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
+        response = await asyncio.to_thread(
+            self.make_request,
+            method="POST",
+            url=url,
+            headers=self.azure_config.get_devops_headers(),
+            json={"query": self._build_wiql_query(GetTasksQuery())}
+        )
+        work_item_ids = self._extract_work_item_ids(self._decode_json(response))
+        
+        batch_url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/workitemsbatch?api-version=7.1"
+        batch_size = self.WORK_ITEMS_BATCH_SIZE
+        responses = await asyncio.gather(*(
+            asyncio.to_thread(
+                self.make_request,
+                method="POST",
+                url=batch_url,
+                headers=self.azure_config.get_devops_headers(),
+                json={"ids": work_item_ids[i:i + batch_size], "fields": list(_ASSIGNEE_FIELDS)}
+            )
+            for i in range(0, len(work_item_ids), batch_size)
+        ))
+        
+        names: Dict[str, None] = {}
+        for response in responses:
+            for item in self._decode_json(response).get("value", []):
+                fields = item.get("fields", {})
+                if fields.get("System.WorkItemType") != "Task":
+                    continue
+                # Identity fields come back as objects; keep plain strings as-is
+                assigned = fields.get("System.AssignedTo")
+                if isinstance(assigned, dict):
+                    assigned = assigned.get("displayName")
+                if assigned and (name := assigned.strip()):
+                    names.setdefault(name)
+        return list(names)
+    
     def _build_wiql_query(self, params: GetTasksQuery) -> str:
         """
         Build WIQL query based on parameters.
         
         Two modes:
-        1. No Epic selected: Query all tasks in DELTA area
+        1. No Epic selected: Query all tasks in the configured area
         2. Epic selected: Query only tasks under that Epic (hierarchical)
         
         Args:
@@ -108,126 +230,93 @@ class GetTasksService(BaseService[GetTasksQuery, GetTasksResponse]):
         
         epic_id = project_context.get("epic_id")
         
-        # Mode 1: No Epic selected - query all DELTA
-        if not epic_id:
-            return self._build_all_delta_query(params)
-        
-        # Mode 2: Epic selected - query specific Epic hierarchy
-        return self._build_epic_hierarchy_query(params, epic_id)
+        return self._build_tasks_query(params, epic_id or None)
     
-    def _build_all_delta_query(self, params: GetTasksQuery) -> str:
+    def _build_tasks_query(self, params: GetTasksQuery, epic_id: Optional[int] = None) -> str:
         """
-        Build query to get all tasks from Projeto DELTA area (no Epic filter).
+        Build the tasks WIQL query from two orthogonal toggles.
+        
+        - epic_id: None queries all tasks in the configured area (flat
+          workitems query); otherwise traverses the Epic hierarchy
+          (Epic → Feature → User Story → Task) through workitemLinks.
+        - area path: taken from azure_config.devops_area_path so the same
+          query serves every deployment.
         
         Args:
             params: Query parameters
+            epic_id: Optional Epic work item ID
             
         Returns:
             WIQL query string
         """
-        # Handle both dict and GetTasksQuery object
-        person_name = params.get('person_name') if isinstance(params, dict) else params.person_name
-        task_state = params.get('task_state') if isinstance(params, dict) else params.task_state
-        tags = params.get('tags') if isinstance(params, dict) else params.tags
+        person_name, task_state, tags = self._get_wiql_filters(params)
+        area_path = self._escape_wiql_value(self.azure_config.devops_area_path, max_length=256)
+        
+        has_epic = epic_id is not None
+        # Filters apply to the link target in hierarchical queries
+        field = "[Target].[{}]" if has_epic else "[{}]"
+        
+        if has_epic:
+            conditions = [
+                f"[Source].[System.Id] = {int(epic_id)}",
+                "[System.Links.LinkType] = 'System.LinkTypes.Hierarchy-Forward'",
+                f"{field.format('System.WorkItemType')} IN ('Task', 'Bug', 'User Story', 'Feature')",
+            ]
+        else:
+            conditions = [f"{field.format('System.WorkItemType')} = 'Task'"]
+        
+        conditions.append(f"{field.format('System.AreaPath')} = '{area_path}'")
+        if person_name:
+            conditions.append(f"{field.format('System.AssignedTo')} CONTAINS '{person_name}'")
+        if task_state:
+            conditions.append(f"{field.format('System.State')} = '{task_state}'")
+        if tags:
+            conditions.append(f"{field.format('System.Tags')} CONTAINS '{tags}'")
+        
+        where_clause = "\n    AND ".join(conditions)
+        
+        if has_epic:
+            tail = "ORDER BY [System.Id] ASC\nMODE (Recursive)"
+        else:
+            tail = "ORDER BY [Microsoft.VSTS.Common.StackRank] ASC, [System.Id] ASC"
         
-        # Build optional filters
-        person_filter = f"AND [System.AssignedTo] CONTAINS '{person_name}'" if person_name else ""
-        state_filter = f"AND [System.State] = '{task_state}'" if task_state else ""
-        tags_filter = f"AND [System.Tags] CONTAINS '{tags}'" if tags else ""
-        
-        query = f"""SELECT
-    [System.Id],
-    [System.WorkItemType],
-    [System.Title],
-    [System.State],
-    [Microsoft.VSTS.Common.ValueArea],
-    [System.Tags],
-    [Custom.EstimatedHours],
-    [Custom.FullHours],
-    [System.AssignedTo],
-    [Custom.AreaName],
-    [Custom.ClientFace],
-    [Custom.ProductOwner],
-    [System.Description],
-    [Microsoft.VSTS.Scheduling.RemainingWork],
-    [System.IterationPath],
-    [System.AreaPath],
-    [Microsoft.VSTS.Common.StackRank]
-FROM WorkItems
-WHERE
-    [System.WorkItemType] = 'Task'
-    AND [System.AreaPath] = 'HUB GenAI\\\\Projeto DELTA'
-    {person_filter}
-    {state_filter}
-    {tags_filter}
-ORDER BY [Microsoft.VSTS.Common.StackRank] ASC, [System.Id] ASC"""
-        
-        return query
+        return (
+            f"SELECT\n    {_SELECT_FIELDS}\n"
+            f"FROM {'workitemLinks' if has_epic else 'WorkItems'}\n"
+            f"WHERE\n    {where_clause}\n"
+            f"{tail}"
+        )
     
-    def _build_epic_hierarchy_query(self, params: GetTasksQuery, epic_id: int) -> str:
+    def _get_wiql_filters(self, params: GetTasksQuery) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
-        Build hierarchical query to get tasks under specific Epic.
-        Uses workitemLinks to traverse Epic → Feature → User Story → Task hierarchy.
+        Get sanitized filter values for WIQL interpolation.
+        Unknown states are dropped; person and tags are quote-escaped.
         
         Args:
             params: Query parameters
-            epic_id: Epic work item ID
             
         Returns:
-            Hierarchical WIQL query string
+            Tuple of (person_name, task_state, tags)
         """
         # Handle both dict and GetTasksQuery object
         person_name = params.get('person_name') if isinstance(params, dict) else params.person_name
         task_state = params.get('task_state') if isinstance(params, dict) else params.task_state
         tags = params.get('tags') if isinstance(params, dict) else params.tags
         
-        # Build optional filters
-        person_filter = ""
-        if person_name:
-            person_filter = f"AND [Target].[System.AssignedTo] CONTAINS '{person_name}'"
-        
-        state_filter = ""
-        if task_state:
-            state_filter = f"AND [Target].[System.State] = '{task_state}'"
+        state = self._canonical_state(task_state)
+        if task_state and not state and self.logger:
+            self.logger.warning(f"Ignoring unknown task state filter: {task_state[:50]}")
         
-        tags_filter = ""
-        if tags:
-            tags_filter = f"AND [Target].[System.Tags] CONTAINS '{tags}'"
-        
-        query = f"""SELECT
-    [System.Id],
-    [System.WorkItemType],
-    [System.Title],
-    [System.State],
-    [Microsoft.VSTS.Common.ValueArea],
-    [System.Tags],
-    [Custom.EstimatedHours],
-    [Custom.FullHours],
-    [System.AssignedTo],
-    [Custom.AreaName],
-    [Custom.ClientFace],
-    [Custom.ProductOwner],
-    [System.Description],
-    [Microsoft.VSTS.Scheduling.RemainingWork],
-    [System.AreaPath],
-    [System.IterationPath]
-FROM workitemLinks
-WHERE
-    [Source].[System.Id] = {epic_id}
-    AND [System.Links.LinkType] = 'System.LinkTypes.Hierarchy-Forward'
-    AND [Target].[System.WorkItemType] IN ('Task', 'Bug', 'User Story', 'Feature')
-    AND [Target].[System.AreaPath] = 'HUB GenAI\\\\Projeto DELTA'
-    {person_filter}
-    {state_filter}
-    {tags_filter}
-ORDER BY [System.Id] ASC
-MODE (Recursive)"""
-        
-        return query
+        return self._escape_wiql_value(person_name), state, self._escape_wiql_value(tags)
+    
+    @staticmethod
+    def _canonical_state(task_state: Optional[str]) -> Optional[str]:
+        """Map a requested state to its canonical WIQL value, or None if it is not a known state."""
+        return _ALLOWED_STATES.get(task_state.strip().lower()) if task_state else None
     
     def _build_filter_summary(self, params: GetTasksQuery) -> dict:
         """
-        Build summary of applied filters.
+        Build summary of applied filters (an unknown state is not applied, so it is omitted).
         
         Args:
             params: Query parameters
@@ -243,7 +332,7 @@ MODE (Recursive)"""
         
         return {
             "person": person_name,
-            "state": task_state,
+            "state": self._canonical_state(task_state),
             "type": task_type,
             "tags": tags,
             "date_range": None  # Dates not implemented yet
@@ -255,7 +344,9 @@ MODE (Recursive)"""
         work_item_ids: List[int]
     ) -> List[Dict[str, Any]]:
         """
-        Get detailed information for work items.
+        Get detailed information for work items, served from the process-local
+        cache when fresh. Ids are split into batches of WORK_ITEMS_BATCH_SIZE
+        that are requested concurrently.
         
         Args:
             project_id: Azure DevOps project ID
@@ -264,8 +355,72 @@ MODE (Recursive)"""
         Returns:
             List of work item details
         """
-        # Batch request for work items (limit to 200 for API constraints)
-        ids_str = ",".join(str(id) for id in work_item_ids[:200])
+        cache_key = (project_id, tuple(work_item_ids))
+        cached = self._cached_details(cache_key)
+        if cached is not None:
+            return cached
+        
+        ids = cache_key[1]
+        batch_size = self.WORK_ITEMS_BATCH_SIZE
+        batches = await asyncio.gather(*(
+            asyncio.to_thread(self._request_details, project_id, ids[i:i + batch_size])
+            for i in range(0, len(ids), batch_size)
+        ))
+        
+        items = [item for batch in batches for item in batch]
+        _details_cache_put(cache_key, items)
+        return items
+    
+    def _fetch_work_item_details(
+        self,
+        project_id: str,
+        work_item_ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Blocking variant of _get_work_item_details (batches fetched one after
+        another), for code already running in a worker thread.
+        
+        Args:
+            project_id: Azure DevOps project ID
+            work_item_ids: List of work item IDs
+            
+        Returns:
+            List of work item details
+        """
+        cache_key = (project_id, tuple(work_item_ids))
+        cached = self._cached_details(cache_key)
+        if cached is not None:
+            return cached
+        
+        ids = cache_key[1]
+        batch_size = self.WORK_ITEMS_BATCH_SIZE
+        items = [
+            item
+            for i in range(0, len(ids), batch_size)
+            for item in self._request_details(project_id, ids[i:i + batch_size])
+        ]
+        _details_cache_put(cache_key, items)
+        return items
+    
+    def _cached_details(self, cache_key: Tuple[str, Tuple[int, ...]]) -> Optional[List[Dict[str, Any]]]:
+        """Look up work item details in the process-local cache, logging hits."""
+        cached = _details_cache_get(cache_key)
+        if cached is not None and self.logger:
+            self.logger.info(f"Work item details served from cache ({len(cache_key[1])} ids)")
+        return cached
+    
+    def _request_details(self, project_id: str, ids: Tuple[int, ...]) -> List[Dict[str, Any]]:
+        """
+        Request one batch of work items (at most WORK_ITEMS_BATCH_SIZE ids).
+        
+        Args:
+            project_id: Azure DevOps project ID
+            ids: Work item IDs of the batch
+            
+        Returns:
+            Work item details of the batch
+        """
+        ids_str = ",".join(map(str, ids))
         url = self.azure_config.get_devops_url(project_id) + f"/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
         
         # Use base service method with timeout and retry
@@ -274,8 +429,102 @@ MODE (Recursive)"""
             url=url,
             headers=self.azure_config.get_devops_headers()
         )
+        return self._decode_json(response).get("value", [])
+    
+    def _extract_work_item_ids(self, data: Dict[str, Any]) -> List[int]:
+        """
+        Extract work item IDs from a WIQL response.
+        
+        Args:
+            data: WIQL response JSON (flat or hierarchical)
+            
+        Returns:
+            List of work item IDs
+        """
+        relations = data.get("workItemRelations", [])
+        
+        if relations:
+            # Hierarchical query response (Epic → Tasks structure);
+            # dict.fromkeys dedups while keeping a stable, insertion-ordered list
+            return list(dict.fromkeys(
+                work_item["id"]
+                for relation in relations
+                for work_item in (relation.get("source"), relation.get("target"))
+                if work_item and work_item.get("id")
+            ))
+        
+        # Simple query response (direct work items)
+        return [item["id"] for item in data.get("workItems", [])]
+    
+    def _schedule_sibling_prefetch(self, project_id: str) -> None:
+        """
+        Start a background prefetch of the sibling Epics recorded at project selection.
+        
+        Args:
+            project_id: Azure DevOps project ID
+        """
+        from backend.agents.memory import get_memory
+        context = get_memory().get_context(self.session_id or "")
+        project_context = context.get("project_context", {})
+        
+        siblings = project_context.get("siblings") or []
+        if not project_context.get("epic_id") or not siblings:
+            return
+        
+        # Skip siblings whose prefetched details are still fresh (and drop expired marks)
+        now = time.monotonic()
+        with _CACHE_LOCK:
+            for key, prefetched_at in list(_SIBLING_PREFETCHED.items()):
+                if now - prefetched_at > _DETAILS_CACHE_TTL:
+                    del _SIBLING_PREFETCHED[key]
+            siblings = [epic_id for epic_id in siblings if (project_id, epic_id) not in _SIBLING_PREFETCHED]
+            for epic_id in siblings:
+                _SIBLING_PREFETCHED[(project_id, epic_id)] = now
+        if not siblings:
+            return
+        
+        task = asyncio.create_task(self._prefetch_siblings(project_id, siblings))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _prefetch_siblings(self, project_id: str, epic_ids: List[int]) -> None:
+        """
+        Fetch unfiltered task details for each sibling Epic into the cache.
+        Failures are only logged: a missed prefetch just means a cold request later.
         
-        return response.json().get("value", [])
+        Args:
+            project_id: Azure DevOps project ID
+            epic_ids: Epic work item IDs to prefetch
+        """
+        for epic_id in epic_ids:
+            try:
+                await asyncio.to_thread(self._prefetch_epic, project_id, epic_id)
+            except Exception as e:
+                with _CACHE_LOCK:
+                    _SIBLING_PREFETCHED.pop((project_id, epic_id), None)
+                if self.logger:
+                    self.logger.warning(f"Prefetch failed for Epic {epic_id}: {str(e)}")
+    
+    def _prefetch_epic(self, project_id: str, epic_id: int) -> None:
+        """
+        Run the Epic hierarchy query and cache the resulting work item details.
+        
+        Args:
+            project_id: Azure DevOps project ID
+            epic_id: Epic work item ID
+        """
+        wiql_query = self._build_tasks_query(GetTasksQuery(), epic_id)
+        url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
+        response = self.make_request(
+            method="POST",
+            url=url,
+            headers=self.azure_config.get_devops_headers(),
+            json={"query": wiql_query}
+        )
+        
+        work_item_ids = self._extract_work_item_ids(self._decode_json(response))
+        if work_item_ids:
+            self._fetch_work_item_details(project_id, work_item_ids)
     
     def _process_work_items(
         self,
@@ -309,35 +558,38 @@ MODE (Recursive)"""
         epic_info = None
         
         for item in work_items:
-            # Use existing WorkItem model for data transformation
-            work_item = WorkItem.from_json(item)
-            
             fields = item.get("fields", {})
             work_item_type = fields.get("System.WorkItemType")
             
-            # Store Epic info when in epic mode
-            if work_item_type == "Epic" and epic_id and work_item.id == epic_id:
+            # Store Epic info when in epic mode (read straight from raw fields)
+            if work_item_type == "Epic" and epic_id and item.get("id") == epic_id:
                 epic_info = {
-                    "id": work_item.id or 0,
-                    "title": work_item.title or "Untitled",
-                    "state": work_item.state or "Unknown"
+                    "id": item.get("id") or 0,
+                    "title": fields.get("System.Title") or "Untitled",
+                    "state": fields.get("System.State") or "Unknown"
                 }
             
-            # Collect only Tasks
+            # Only Tasks are returned; skip model construction for everything else
             if work_item_type == "Task":
+                # Use existing WorkItem model for data transformation
+                work_item = WorkItem.from_json(item)
+                
                 # Convert WorkItem to TaskItem for response
                 assigned_to_display = None
                 if work_item.assignedTo:
                     assigned_to_display = work_item.assignedTo.displayName
                 
+                created_raw = fields.get("System.CreatedDate") or ""
+                changed_raw = fields.get("System.ChangedDate") or ""
+                
                 task = TaskItem(
                     id=work_item.id or 0,
                     title=work_item.title or "Untitled",
                     state=work_item.state or "Unknown", 
                     assigned_to=assigned_to_display,
                     work_item_type=work_item_type,
-                    created_date=fields.get("System.CreatedDate", "")[:10] if fields.get("System.CreatedDate") else "",
-                    changed_date=fields.get("System.ChangedDate", "")[:10] if fields.get("System.ChangedDate") else "",
+                    created_date=created_raw[:10],
+                    changed_date=changed_raw[:10],
                     description=fields.get("System.Description", ""),
                     value_area=fields.get("Microsoft.VSTS.Common.ValueArea"),
                     tags=fields.get("System.Tags"),
@@ -349,23 +601,6 @@ MODE (Recursive)"""
                 )
                 tasks.append(task)
         
-        # Generate Portuguese message
-        if len(tasks) == 0:
-            message = "Nenhuma tarefa encontrada com os critérios especificados."
-        elif len(tasks) == 1:
-            message = "Encontrada 1 tarefa"
-        else:
-            message = f"Encontradas {len(tasks)} tarefas"
-            
-        # Add scope context
-        if scope == "all":
-            message += " em todos os projetos do DELTA."
-        else:
-            epic_name = project_context.get("project_name", "projeto")
-            message += f" do {epic_name}."
-        
-        
-        
         # Group tasks by person (person_name: [task_titles])
         tasks_by_person = {}
         task_count_by_person = {}
@@ -384,37 +619,35 @@ MODE (Recursive)"""
             if state not in task_count_by_state:
                 task_count_by_state[state] = 0
             task_count_by_state[state] += 1
-        
-        #complementing the mesage
-        # Add how many tasks has it user
-        # Add how many tasks per state
-        # If less than 20 tasks add tem to the message
-        # Add filter info to message if filters were applied
+
         person_name = params.get('person_name') if isinstance(params, dict) else params.person_name
         task_state = params.get('task_state') if isinstance(params, dict) else params.task_state
         tags = params.get('tags') if isinstance(params, dict) else params.tags
         
-        if person_name:
-            message += f" Filtrado por pessoa: {person_name}."
-        else:
-            # Add task count per person to message
-            for person, count in task_count_by_person.items():
-                message += f" {person} tem {count} tarefa(s)."
-                
-        if task_state:
-            message += f" Estado: {task_state}."
-        else:
-            # Add task count per state to message
-            for state, count in task_count_by_state.items():
-                message += f" {count} tarefa(s) estão em estado '{state}'."
-
+        # Generate Portuguese message from the (count bucket, scope) template
+        count = len(tasks)
+        bucket = "zero" if count == 0 else "one" if count == 1 else "many"
+        epic_name = project_context.get("project_name", "projeto")
+        base = _MSG_TEMPLATES[(bucket, scope)].format(n=count, project=epic_name)
+        
+        # Filter info when applied, otherwise per-person / per-state counts
+        suffixes = [f" Filtrado por pessoa: {person_name}."] if person_name else [
+            f" {person} tem {n} tarefa(s)." for person, n in task_count_by_person.items()
+        ]
+        state_filter = self._canonical_state(task_state)
+        suffixes += [f" Estado: {state_filter}."] if state_filter else [
+            f" {n} tarefa(s) estão em estado '{state}'." for state, n in task_count_by_state.items()
+        ]
+        if task_state and not state_filter:
+            suffixes.append(f" Estado '{task_state}' não reconhecido; filtro de estado ignorado.")
         if tags:
-            message += f" Tags: {tags}."
-
-        # If less than 20 tasks add tem to the message
-        if len(tasks) <= 20:
-            task_titles = ", ".join([task.title for task in tasks])
-            message += f" As tarefas são: {task_titles}."
+            suffixes.append(f" Tags: {tags}.")
+        
+        # If less than 20 tasks add them to the message
+        if count <= 20:
+            suffixes.append(f" As tarefas são: {', '.join(task.title for task in tasks)}.")
+        
+        message = base + "".join(suffixes)
 
         # Build hierarchy if Epic selected
         hierarchy = None
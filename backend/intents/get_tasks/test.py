@@ -2,10 +2,12 @@
 Tests for get_tasks intent.
 """
 
+import asyncio
+import json
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from backend.intents.get_tasks.models import GetTasksQuery, GetTasksResponse, TaskItem
-from backend.intents.get_tasks.service import GetTasksService
+from backend.intents.get_tasks.service import GetTasksService, _DETAILS_CACHE, _SIBLING_PREFETCHED
 from backend.intents.get_tasks.extractor import GetTasksExtractor
 
 
@@ -70,17 +72,104 @@ class TestGetTasksExtractor:
 class TestGetTasksService:
     """Tests for GetTasksService."""
     
+    @staticmethod
+    def _mock_devops(wiql_json, workitems_json):
+        """Fake the HTTP session: answer WIQL POSTs and work item GETs with canned JSON."""
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.raise_for_status.return_value = None
+            response.content = json.dumps(wiql_json if "/wiql" in url else workitems_json).encode()
+            return response
+        return fake_request
+    
     @pytest.mark.asyncio
     async def test_query_data_empty_response(self, service):
-        """Test query_data returns empty response when not implemented."""
+        """Test query_data returns empty response when WIQL finds nothing."""
         params = GetTasksQuery(user_query="test query")
-        response = await service.query_data(params)
+        fake = self._mock_devops({"workItems": []}, {"value": []})
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            response = await service.query_data(params)
         
         assert isinstance(response, GetTasksResponse)
         assert response.total_count == 0
         assert len(response.tasks) == 0
-        assert "not yet implemented" in response.message
+        assert request.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_query_data_with_work_items(self, service):
+        """Test query_data fetches details, keeps only Tasks and caches details."""
+        _DETAILS_CACHE.clear()
+        params = GetTasksQuery(user_query="test query")
+        wiql = {"workItems": [{"id": 1}, {"id": 2}]}
+        details = {"value": [
+            {"id": 1, "fields": {"System.WorkItemType": "Task", "System.Title": "Task A", "System.State": "Active"}},
+            {"id": 2, "fields": {"System.WorkItemType": "User Story", "System.Title": "Story", "System.State": "New"}},
+        ]}
+        fake = self._mock_devops(wiql, details)
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            response = await service.query_data(params)
+        
+        assert request.call_count == 2
+        assert "ids=1,2" in request.call_args_list[1].kwargs["url"]
+        assert response.total_count == 1
+        assert response.tasks[0].title == "Task A"
+        
+        # Same ids again: WIQL runs, details come from the cache
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            await service.query_data(params)
+        assert request.call_count == 1
     
+    @pytest.mark.asyncio
+    async def test_get_work_item_details_batches_ids(self, service):
+        """Test more than 200 ids are fetched in batches instead of truncated."""
+        _DETAILS_CACHE.clear()
+        def fake_request(method, url, **kwargs):
+            ids = url.split("ids=")[1].split("&")[0].split(",")
+            response = Mock(status_code=200)
+            response.content = json.dumps({"value": [{"id": int(i)} for i in ids]}).encode()
+            return response
+
+        with patch.object(service._session, "request", side_effect=fake_request) as request:
+            items = await service._get_work_item_details("p", list(range(450)))
+
+        assert request.call_count == 3
+        assert [item["id"] for item in items] == list(range(450))
+
+    @pytest.mark.asyncio
+    async def test_query_assignees(self, service):
+        """Test assignees of Tasks are listed once, requesting only the needed fields."""
+        wiql = {"workItems": [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]}
+        details = {"value": [
+            {"id": 1, "fields": {"System.WorkItemType": "Task", "System.AssignedTo": {"displayName": "Ana"}}},
+            {"id": 2, "fields": {"System.WorkItemType": "User Story", "System.AssignedTo": {"displayName": "Bia"}}},
+            {"id": 3, "fields": {"System.WorkItemType": "Task", "System.AssignedTo": {"displayName": " Ana "}}},
+            {"id": 4, "fields": {"System.WorkItemType": "Task"}},
+        ]}
+        fake = self._mock_devops(wiql, details)
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            names = await service.query_assignees()
+
+        assert names == ["Ana"]
+        assert request.call_args_list[1].kwargs["json"] == {
+            "ids": [1, 2, 3, 4],
+            "fields": ["System.WorkItemType", "System.AssignedTo"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_sibling_prefetch_skipped_while_fresh(self, service):
+        """Test sibling Epics are not prefetched again while their details are fresh."""
+        from backend.agents.memory import get_memory
+        _SIBLING_PREFETCHED.clear()
+        get_memory().update_project_context("test_session", epic_id=10, siblings=[11, 12])
+
+        with patch.object(service, "_prefetch_siblings", new=AsyncMock()) as prefetch:
+            service._schedule_sibling_prefetch("p")
+            service._schedule_sibling_prefetch("p")
+            await asyncio.gather(*GetTasksService._background_tasks)
+
+        prefetch.assert_awaited_once_with("p", [11, 12])
+        get_memory().clear("test_session")
+
     def test_build_wiql_query_basic(self, service):
         """Test WIQL query building."""
         params = GetTasksQuery(user_query="test")
@@ -104,6 +193,14 @@ class TestGetTasksService:
         
         assert "[System.State] = 'Active'" in query
     
+    def test_build_wiql_query_sanitizes_filters(self, service):
+        """Test WIQL filters are escaped and unknown states dropped."""
+        params = GetTasksQuery(user_query="test", person_name="O'Brien' OR 1=1", task_state="Bogus")
+        query = service._build_wiql_query(params)
+
+        assert "[System.AssignedTo] CONTAINS 'O''Brien'' OR 1=1'" in query
+        assert "[System.State] =" not in query
+
     def test_build_wiql_query_with_type(self, service):
         """Test WIQL query with work item type filter."""
         params = GetTasksQuery(user_query="test", task_type="Bug")
@@ -111,10 +208,50 @@ class TestGetTasksService:
         
         assert "[System.WorkItemType] = 'Bug'" in query
 
+    def test_extract_work_item_ids_hierarchical_order(self, service):
+        """Test hierarchical WIQL ids are deduplicated in first-seen order."""
+        data = {"workItemRelations": [
+            {"source": None, "target": {"id": 10}},
+            {"source": {"id": 10}, "target": {"id": 30}},
+            {"source": {"id": 10}, "target": {"id": 20}},
+            {"source": {"id": 30}, "target": {"id": 20}},
+        ]}
+        
+        assert service._extract_work_item_ids(data) == [10, 30, 20]
+    
+    def test_process_work_items_message(self, service):
+        """Test summary message built from the templates."""
+        work_items = [
+            {"id": 1, "fields": {"System.WorkItemType": "Task", "System.Title": "Task A", "System.State": "Active"}},
+            {"id": 2, "fields": {"System.WorkItemType": "Task", "System.Title": "Task B", "System.State": "Active"}},
+            {"id": 3, "fields": {"System.WorkItemType": "User Story", "System.Title": "Story", "System.State": "New"}},
+        ]
+        response = service._process_work_items(work_items, GetTasksQuery(user_query="test", person_name="João"))
+
+        assert response.total_count == 2
+        assert response.message.startswith("Encontradas 2 tarefas em todos os projetos do DELTA.")
+        assert " Filtrado por pessoa: João." in response.message
+        assert " 2 tarefa(s) estão em estado 'Active'." in response.message
+        assert response.message.endswith(" As tarefas são: Task A, Task B.")
+
+    def test_process_work_items_unknown_state_not_reported(self, service):
+        """Test an unknown state (dropped from the WIQL) is not reported as an applied filter."""
+        work_items = [
+            {"id": 1, "fields": {"System.WorkItemType": "Task", "System.Title": "Task A", "System.State": "Active"}},
+        ]
+        response = service._process_work_items(work_items, GetTasksQuery(user_query="test", task_state="Bogus"))
+
+        assert response.filtered_by["state"] is None
+        assert " Estado: Bogus." not in response.message
+        assert " 1 tarefa(s) estão em estado 'Active'." in response.message
+        assert " Estado 'Bogus' não reconhecido; filtro de estado ignorado." in response.message
+        assert service._build_filter_summary(GetTasksQuery(user_query="test", task_state="active"))["state"] == "Active"
+
 
 class TestGetTasksIntegration:
     """Integration tests for get_tasks intent."""
     
+    @pytest.mark.integration
     @pytest.mark.asyncio
     async def test_full_flow_basic(self, extractor, service):
         """Test complete flow from extraction to service."""
@@ -184,7 +184,7 @@ async def fetch_work_item_details(service, config, work_item_ids):
     """Fetch detailed information for work items."""
     try:
         # Build work items API URL
-        ids_str = ",".join(str(id) for id in work_item_ids)
+        ids_str = ",".join(map(str, work_item_ids))
         project_id = config.devops_project_id
         url = config.get_devops_url(project_id) + f"/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
         headers = config.get_devops_headers()
@@ -224,7 +224,7 @@ async def fetch_work_item_details(service, config, work_item_ids):
 async def fetch_simple_work_item_details(service, config, work_item_ids):
     """Fetch details for simple query comparison."""
     try:
-        ids_str = ",".join(str(id) for id in work_item_ids)
+        ids_str = ",".join(map(str, work_item_ids))
         project_id = config.devops_project_id
         url = config.get_devops_url(project_id) + f"/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
         headers = config.get_devops_headers()
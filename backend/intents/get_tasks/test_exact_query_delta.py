@@ -5,21 +5,63 @@ Standalone version - no dependencies on intent system.
 """
 
 import asyncio
+import json
+import logging
 import sys
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import base64
+import hashlib
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+import pytest
 from dotenv import load_dotenv
 
+try:
+    import ijson  # optional: incremental parsing of large WIQL responses
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding of large payloads
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
 # Load environment variables
 load_dotenv()
 
+# Verbose output goes through logging so it costs nothing when the level is off
+logger = logging.getLogger("test_exact_query_delta")
+
 # Azure DevOps configuration
 AZURE_DEVOPS_URL = os.getenv("AZURE_DEVOPS_URL")
 AZURE_DEVOPS_TOKEN = os.getenv("AZURE_DEVOPS_TOKEN")
 PROJECT_ID = "b50492f0-02ea-47c0-a987-f5404c7e2f89"
 
-# Encode token properly for Basic Auth
+# Canonical work item tracking base URL, built once
+_BASE = f"{(AZURE_DEVOPS_URL or '').rstrip('/')}/{PROJECT_ID}/_apis/wit"
+
+# Only the fields the detail printers read; keeps workitems responses small
+FIELDS = (
+    "System.Id",
+    "System.WorkItemType",
+    "System.Title",
+    "System.State",
+    "System.AssignedTo",
+    "System.AreaPath",
+    "System.IterationPath",
+)
+
+# Encode token properly for Basic Auth (token is static, encode once)
+@lru_cache(maxsize=1)
 def get_auth_header():
     """Generate properly encoded Basic Auth header."""
     token = f":{AZURE_DEVOPS_TOKEN}"
@@ -27,6 +69,104 @@ def get_auth_header():
     return f"Basic {encoded}"
 
 
+# Shared session: reuses the TCP/TLS connection across the WIQL POST
+# and the workitems GETs instead of reconnecting on every call
+_AUTH_HEADER = get_auth_header()
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "Content-Type": "application/json",
+    "Authorization": _AUTH_HEADER
+})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
+# Bound on concurrent Azure DevOps calls (kept within the session pool size)
+_MAX_CONCURRENCY = 16
+
+
+async def _request(method, url, limiter=None, **kwargs):
+    """
+    Run a blocking session call in a worker thread so calls can overlap.
+    An optional asyncio.Semaphore bounds how many run at once.
+    """
+    if limiter is None:
+        return await asyncio.to_thread(_SESSION.request, method, url, **kwargs)
+    async with limiter:
+        return await asyncio.to_thread(_SESSION.request, method, url, **kwargs)
+
+
+# On-disk TTL cache for WIQL results and work item batches
+_CACHE_DIR = Path(tempfile.gettempdir())
+_CACHE_TTL = int(os.getenv("WIQL_CACHE_TTL", "300"))  # seconds
+
+
+def _cache_read(key):
+    """Return cached JSON for key if the file exists and is younger than the TTL."""
+    path = _CACHE_DIR / f"{key}.json"
+    if path.exists() and time.time() - path.stat().st_mtime < _CACHE_TTL:
+        return _json_loads(path.read_bytes())
+    return None
+
+
+def _cache_write(key, data):
+    """Store JSON for key in the cache directory."""
+    (_CACHE_DIR / f"{key}.json").write_text(json.dumps(data))
+
+
+# Saved query reuse (opt-in: it creates a persistent query under "My Queries" in
+# the DevOps account). The query id is cached next to a hash of the WIQL text;
+# an empty id records a failed save so it is not retried on every run
+_USE_SAVED_QUERY = bool(os.getenv("WIQL_SAVED_QUERY"))
+_QUERY_ID_FILE = _CACHE_DIR / "delta_wiql_id"
+_SAVED_QUERY_FOLDER = "My Queries"
+_SAVED_QUERY_NAME = "delta-tasks"
+
+
+def _wiql_hash(wiql_query):
+    """Short stable hash of the WIQL text (detects edits to the saved query)."""
+    return hashlib.blake2b(wiql_query.encode(), digest_size=16).hexdigest()
+
+
+async def _save_query(wiql_query):
+    """Save the WIQL as a shared query and cache its id (or the failure); returns the id or None."""
+    url = f"{_BASE}/queries/{_SAVED_QUERY_FOLDER}?api-version=7.1"
+    name = f"{_SAVED_QUERY_NAME}-{_wiql_hash(wiql_query)[:8]}"
+    response = await _request("POST", url, data=_json_dumps({"name": name, "wiql": wiql_query}))
+    query_id = _json_loads(response.content).get("id") if response.ok else None
+    if not query_id:
+        logger.warning(f"⚠️ Could not save query ({response.status_code}), using inline WIQL")
+    _QUERY_ID_FILE.write_text(f"{_wiql_hash(wiql_query)}:{query_id or ''}")
+    return query_id
+
+
+async def _run_wiql(wiql_query):
+    """
+    Run the WIQL through its saved query id (GET, tiny request) when WIQL_SAVED_QUERY
+    is set. Saves the query on first run and falls back to the inline POST if the
+    cached id is stale or saving failed (failures are cached for this WIQL text).
+    """
+    base_url = f"{_BASE}/wiql"
+    
+    query_id = None
+    if _USE_SAVED_QUERY:
+        cached = None
+        if _QUERY_ID_FILE.exists():
+            cached_hash, _, cached_id = _QUERY_ID_FILE.read_text().strip().partition(":")
+            if cached_hash == _wiql_hash(wiql_query):
+                cached = cached_id
+        query_id = cached if cached is not None else await _save_query(wiql_query)
+    
+    if query_id:
+        response = await _request("GET", f"{base_url}/{query_id}?api-version=7.1")
+        if response.status_code != 404:
+            return response
+        logger.warning("⚠️ Cached query id not found, falling back to inline WIQL")
+        _QUERY_ID_FILE.unlink(missing_ok=True)
+    
+    return await _request("POST", f"{base_url}?api-version=7.1", data=_json_dumps({"query": wiql_query}))
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
 async def test_exact_query():
     """Test the exact WIQL query provided by user."""
     
@@ -77,114 +217,120 @@ ORDER BY [Microsoft.VSTS.Common.StackRank] ASC,
     [System.Id] ASC
 MODE (Recursive, ReturnMatchingChildren)"""
     
-    print("=== TESTING EXACT USER QUERY ===")
-    print(f"Query length: {len(wiql_query)} characters")
-    print("\nQuery:")
-    print(wiql_query)
+    logger.info("=== TESTING EXACT USER QUERY ===")
+    logger.info(f"Query length: {len(wiql_query)} characters")
+    logger.debug("\nQuery:\n%s", wiql_query)
     
-    # Build URL and headers
-    url = f"{AZURE_DEVOPS_URL.rstrip('/')}/{PROJECT_ID}/_apis/wit/wiql?api-version=7.1"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": get_auth_header()
-    }
+    # Build URL (auth headers live on the shared session)
+    url = f"{_BASE}/wiql?api-version=7.1"
     
-    print(f"\n=== REQUEST INFO ===")
-    print(f"URL: {url}")
-    print(f"Project ID: {PROJECT_ID}")
-    print(f"Headers: Content-Type and Authorization set")
+    logger.info(f"\n=== REQUEST INFO ===")
+    logger.info(f"URL: {url}")
+    logger.info(f"Project ID: {PROJECT_ID}")
+    logger.info(f"Headers: Content-Type and Authorization set")
     
     try:
-        print(f"\n=== MAKING REQUEST ===")
+        logger.info(f"\n=== MAKING REQUEST ===")
         
-        # Make the request
-        response = requests.post(
-            url=url,
-            headers=headers,
-            json={"query": wiql_query}
-        )
-        
-        print(f"Response Status: {response.status_code}")
-        print(f"Response Headers: {dict(response.headers)}")
-        print(f"Response Text (first 500 chars): {response.text[:500]}")
+        wiql_cache_key = f"wiql_{_wiql_hash(wiql_query)}"
+        data = _cache_read(wiql_cache_key)
         
-        response.raise_for_status()
-        print(f"✅ SUCCESS! Status: {response.status_code}")
-        
-        # Parse response
-        data = response.json()
+        if data is not None:
+            logger.info(f"✅ SUCCESS! WIQL result served from local cache (TTL {_CACHE_TTL}s)")
+        else:
+            # Make the request (saved query id when available, inline WIQL otherwise)
+            response = await _run_wiql(wiql_query)
+            
+            logger.info(f"Response Status: {response.status_code}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response Headers: {dict(response.headers)}")
+                logger.debug(f"Response Text (first 500 chars): {response.text[:500]}")
+            
+            response.raise_for_status()
+            logger.info(f"✅ SUCCESS! Status: {response.status_code}")
+            
+            # Parse response
+            data = _json_loads(response.content)
+            _cache_write(wiql_cache_key, data)
         
-        print(f"\n=== RESPONSE ANALYSIS ===")
-        print(f"Response keys: {list(data.keys())}")
+        logger.info(f"\n=== RESPONSE ANALYSIS ===")
+        logger.debug("Response keys: %s", list(data.keys()))
         
         # Check for work items
         work_items = data.get("workItems", [])
-        print(f"Work items found: {len(work_items)}")
+        logger.info(f"Work items found: {len(work_items)}")
         
-        if work_items:
-            print(f"\n=== FIRST FEW WORK ITEMS ===")
+        if work_items and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"\n=== FIRST FEW WORK ITEMS ===")
             for i, item in enumerate(work_items[:5]):
-                print(f"  {i+1}. ID: {item.get('id')}, URL: {item.get('url', 'No URL')}")
+                logger.debug(f"  {i+1}. ID: {item.get('id')}, URL: {item.get('url', 'No URL')}")
         
         # Check for work item relations
         relations = data.get("workItemRelations", [])
-        print(f"Work item relations found: {len(relations)}")
+        logger.info(f"Work item relations found: {len(relations)}")
         
         if relations:
-            print(f"\n=== FIRST FEW RELATIONS ===")
-            for i, rel in enumerate(relations[:5]):
-                source = rel.get("source")
-                target = rel.get("target")
-                print(f"  {i+1}. Source: {source.get('id') if source else 'None'}, Target: {target.get('id') if target else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"\n=== FIRST FEW RELATIONS ===")
+                for i, rel in enumerate(relations[:5]):
+                    source = rel.get("source")
+                    target = rel.get("target")
+                    logger.debug(f"  {i+1}. Source: {source.get('id') if source else 'None'}, Target: {target.get('id') if target else 'None'}")
             
-            # Extract unique work item IDs from relations
-            work_item_ids = set()
-            for rel in relations:
-                source = rel.get("source")
-                target = rel.get("target")
-                if source and source.get("id"):
-                    work_item_ids.add(source.get("id"))
-                if target and target.get("id"):
-                    work_item_ids.add(target.get("id"))
+            # Extract unique work item IDs from relations (deduplicated, first-seen order)
+            work_item_ids = list(dict.fromkeys(
+                wi["id"]
+                for rel in relations
+                for wi in (rel.get("source"), rel.get("target"))
+                if wi and wi.get("id")
+            ))
             
-            print(f"\n=== EXTRACTED WORK ITEM IDS ===")
-            print(f"Unique work item IDs from relations: {len(work_item_ids)}")
-            print(f"First 10 IDs: {list(work_item_ids)[:10]}")
+            logger.info(f"\n=== EXTRACTED WORK ITEM IDS ===")
+            logger.info(f"Unique work item IDs from relations: {len(work_item_ids)}")
+            logger.debug("First 10 IDs: %s", work_item_ids[:10])
             
             if work_item_ids:
                 # Now get the actual work item details
-                print(f"\n=== FETCHING WORK ITEM DETAILS ===")
-                await fetch_work_item_details(list(work_item_ids)[:10])  # Limit to first 10
+                logger.info(f"\n=== FETCHING WORK ITEM DETAILS ===")
+                await fetch_work_item_details(work_item_ids[:10])  # Limit to first 10
+                
+                # Opt-in: stream the WIQL again and fetch details for every related item
+                if os.getenv("FETCH_ALL_DETAILS"):
+                    logger.info(f"\n=== FETCHING ALL WORK ITEM DETAILS (streamed) ===")
+                    all_items = await fetch_all_relation_details(wiql_query)
+                    logger.info(f"✅ Got details for {len(all_items)} work items")
         
         else:
-            print("No work item relations found - this is why we get 0 work items!")
+            logger.info("No work item relations found - this is why we get 0 work items!")
         
-        # Full response for debugging
-        print(f"\n=== FULL RESPONSE (first 1000 chars) ===")
-        response_text = str(data)
-        print(response_text[:1000])
-        if len(response_text) > 1000:
-            print("... (truncated)")
+        # Full response for debugging (opt-in: serialising large WIQL results is costly)
+        if os.getenv("DEBUG_WIQL") and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"\n=== FULL RESPONSE (first 1000 chars) ===")
+            response_text = json.dumps(data)
+            logger.debug(response_text[:1000])
+            if len(response_text) > 1000:
+                logger.debug("... (truncated)")
         
         return data
         
     except requests.exceptions.RequestException as e:
-        print(f"❌ ERROR: {e}")
-        print(f"Error type: {type(e).__name__}")
+        logger.error(f"❌ ERROR: {e}")
+        logger.error(f"Error type: {type(e).__name__}")
         
         # Print detailed error info
         if hasattr(e, 'response') and e.response:
-            print(f"Response status: {e.response.status_code}")
-            print(f"Response headers: {dict(e.response.headers)}")
-            print(f"Response text: {e.response.text[:1000]}")
+            logger.error(f"Response status: {e.response.status_code}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response headers: {dict(e.response.headers)}")
+                logger.debug(f"Response text: {e.response.text[:1000]}")
         
         import traceback
         traceback.print_exc()
         
         raise
     except Exception as e:
-        print(f"❌ ERROR: {e}")
-        print(f"Error type: {type(e).__name__}")
+        logger.error(f"❌ ERROR: {e}")
+        logger.error(f"Error type: {type(e).__name__}")
         
         import traceback
         traceback.print_exc()
@@ -192,98 +338,185 @@ MODE (Recursive, ReturnMatchingChildren)"""
         raise
 
 
+def _chunks(ids, n=200):
+    """Yield successive n-sized chunks (Azure DevOps caps workitems at 200 IDs per call)."""
+    for i in range(0, len(ids), n):
+        yield ids[i:i + n]
+
+
+async def _fetch_work_items_in_batches(work_item_ids, batch_size=200, limiter=None):
+    """
+    Fetch work items in 200-ID batches; uncached batches are fetched concurrently.
+    Callers running several of these at once pass one shared limiter so the
+    bound on in-flight requests holds across calls.
+    """
+    base_url = f"{_BASE}/workitems"
+    fields_param = ",".join(FIELDS)
+    if limiter is None:
+        limiter = asyncio.Semaphore(_MAX_CONCURRENCY)
+    
+    chunks = list(_chunks(list(work_item_ids), batch_size))
+    cache_keys = [
+        "workitems_" + _wiql_hash(f"{sorted(chunk)}|{fields_param}")
+        for chunk in chunks
+    ]
+    cached = [_cache_read(key) for key in cache_keys]
+    
+    # Only the chunks missing from the cache hit the API
+    missing = [i for i, value in enumerate(cached) if value is None]
+    responses = await asyncio.gather(*(
+        _request(
+            "GET",
+            f"{base_url}?ids={','.join(map(str, chunks[i]))}&fields={fields_param}&api-version=7.1",
+            limiter=limiter
+        )
+        for i in missing
+    ))
+    for i, response in zip(missing, responses):
+        response.raise_for_status()
+        cached[i] = _json_loads(response.content).get("value", [])
+        _cache_write(cache_keys[i], cached[i])
+    
+    work_items = []
+    for value in cached:
+        work_items.extend(value)
+    return work_items
+
+
+def _iter_relation_ids(response):
+    """
+    Yield unique work item IDs from a streamed WIQL response.
+    Parses workItemRelations incrementally with ijson when installed;
+    otherwise falls back to decoding the full body.
+    """
+    if ijson is not None:
+        response.raw.decode_content = True
+        relations = ijson.items(response.raw, "workItemRelations.item")
+    else:
+        relations = _json_loads(response.content).get("workItemRelations", [])
+    
+    seen = set()
+    for rel in relations:
+        for wi in (rel.get("source"), rel.get("target")):
+            if wi and wi.get("id") and wi["id"] not in seen:
+                seen.add(wi["id"])
+                yield wi["id"]
+
+
+async def fetch_all_relation_details(wiql_query, batch_size=200):
+    """
+    Run the WIQL with a streamed response and fetch details for every related item.
+    Each 200-ID batch is dispatched as soon as it is parsed instead of waiting
+    for the whole relations array.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    
+    def produce():
+        # Blocking POST + parse in a worker thread; batches are handed to the loop
+        try:
+            response = _SESSION.post(f"{_BASE}/wiql?api-version=7.1", data=_json_dumps({"query": wiql_query}), stream=True)
+            response.raise_for_status()
+            batch = []
+            for work_item_id in _iter_relation_ids(response):
+                batch.append(work_item_id)
+                if len(batch) == batch_size:
+                    loop.call_soon_threadsafe(queue.put_nowait, batch)
+                    batch = []
+            if batch:
+                loop.call_soon_threadsafe(queue.put_nowait, batch)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+    
+    limiter = asyncio.Semaphore(_MAX_CONCURRENCY)  # shared by every batch of this run
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    tasks = []
+    try:
+        while (batch := await queue.get()) is not None:
+            tasks.append(asyncio.ensure_future(_fetch_work_items_in_batches(batch, batch_size, limiter)))
+        await producer  # re-raise request/parse errors
+        
+        results = await asyncio.gather(*tasks)
+        return [item for batch in results for item in batch]
+    finally:
+        # On failure, don't leave batch fetches running unobserved
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def fetch_work_item_details(work_item_ids):
     """Fetch detailed information for work items."""
     try:
-        # Build work items API URL
-        ids_str = ",".join(str(id) for id in work_item_ids)
-        url = f"{AZURE_DEVOPS_URL.rstrip('/')}/{PROJECT_ID}/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": get_auth_header()
-        }
+        logger.debug("Fetching details for IDs: %s", work_item_ids)
         
-        print(f"Fetching details for IDs: {ids_str}")
-        print(f"URL: {url}")
+        work_items = await _fetch_work_items_in_batches(work_item_ids)
         
-        response = requests.get(url=url, headers=headers)
+        logger.info(f"✅ Got details for {len(work_items)} work items")
         
-        response.raise_for_status()
-        data = response.json()
-        work_items = data.get("value", [])
-        
-        print(f"✅ Got details for {len(work_items)} work items")
-        
-        for item in work_items:
+        for item in work_items if logger.isEnabledFor(logging.DEBUG) else []:
             fields = item.get("fields", {})
-            print(f"  - ID: {item.get('id')}")
-            print(f"    Type: {fields.get('System.WorkItemType')}")
-            print(f"    Title: {fields.get('System.Title', 'No title')}")
-            print(f"    State: {fields.get('System.State')}")
-            print(f"    Assigned: {fields.get('System.AssignedTo', {}).get('displayName', 'Unassigned') if fields.get('System.AssignedTo') else 'Unassigned'}")
-            print(f"    Area: {fields.get('System.AreaPath')}")
-            print(f"    Iteration: {fields.get('System.IterationPath')}")
-            print()
+            logger.debug(f"  - ID: {item.get('id')}")
+            logger.debug(f"    Type: {fields.get('System.WorkItemType')}")
+            logger.debug(f"    Title: {fields.get('System.Title', 'No title')}")
+            logger.debug(f"    State: {fields.get('System.State')}")
+            logger.debug(f"    Assigned: {fields.get('System.AssignedTo', {}).get('displayName', 'Unassigned') if fields.get('System.AssignedTo') else 'Unassigned'}")
+            logger.debug(f"    Area: {fields.get('System.AreaPath')}")
+            logger.debug(f"    Iteration: {fields.get('System.IterationPath')}")
+            logger.debug("")
         
         return work_items
         
     except Exception as e:
-        print(f"❌ Error fetching work item details: {e}")
+        logger.error(f"❌ Error fetching work item details: {e}")
         return []
 
 
 async def fetch_simple_work_item_details(work_item_ids):
     """Fetch details for simple query comparison."""
     try:
-        ids_str = ",".join(str(id) for id in work_item_ids)
-        url = f"{AZURE_DEVOPS_URL.rstrip('/')}/{PROJECT_ID}/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": get_auth_header()
-        }
-        
-        response = requests.get(url=url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        work_items = data.get("value", [])
+        work_items = await _fetch_work_items_in_batches(work_item_ids)
         
         for item in work_items:
             fields = item.get("fields", {})
             assigned_to = fields.get('System.AssignedTo', {})
             assigned_name = assigned_to.get('displayName', 'Unassigned') if assigned_to else 'Unassigned'
             
-            print(f"  ✅ ID: {item.get('id')} | {fields.get('System.Title', 'No title')[:50]}... | {assigned_name}")
+            logger.debug(f"  ✅ ID: {item.get('id')} | {fields.get('System.Title', 'No title')[:50]}... | {assigned_name}")
         
         return work_items
         
     except Exception as e:
-        print(f"❌ Error fetching simple work item details: {e}")
+        logger.error(f"❌ Error fetching simple work item details: {e}")
         return []
 
 
 
 if __name__ == "__main__":
-    print("🔬 TESTING BOTH QUERY APPROACHES - COMPLEX vs SIMPLE!")
-    print("="*70)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+    
+    logger.info("🔬 TESTING BOTH QUERY APPROACHES - COMPLEX vs SIMPLE!")
+    logger.info("="*70)
     
     # Test the complex hierarchical query
-    print("1️⃣ COMPLEX HIERARCHICAL QUERY (workitemLinks)")
+    logger.info("1️⃣ COMPLEX HIERARCHICAL QUERY (workitemLinks)")
     complex_result = asyncio.run(test_exact_query())
     
-    print("\n" + "="*70)
+    logger.info("\n" + "="*70)
     
     # Test simple direct query for comparison  
 
     
-    print("\n" + "="*70)
-    print("🏆 COMPARISON SUMMARY:")
+    logger.info("\n" + "="*70)
+    logger.info("🏆 COMPARISON SUMMARY:")
     
     if complex_result:
         # Compare results
         complex_relations = len(complex_result.get("workItemRelations", []))
         complex_items = len(complex_result.get("workItems", []))
         
-        print(f"📊 Complex Query: {complex_relations} relations, {complex_items} direct items")
+        logger.info(f"📊 Complex Query: {complex_relations} relations, {complex_items} direct items")
         
     
-    print("\n🎭 Moral of the story: Sometimes simple is better! 😄")
\ No newline at end of file
+    logger.info("\n🎭 Moral of the story: Sometimes simple is better! 😄")
\ No newline at end of file
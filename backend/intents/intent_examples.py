@@ -3,12 +3,18 @@ Intent examples registry system.
 Intents can optionally register example prompts for classification testing.
 """
 
-from typing import Dict, List, Optional
-from pydantic import BaseModel
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
-class ExamplePrompt(BaseModel):
-    """Example prompt for intent classification testing."""
+@dataclass(slots=True, frozen=True)
+class ExamplePrompt:
+    """
+    Example prompt for intent classification testing.
+    
+    A slots dataclass (not a pydantic model): built in bulk by get_all, and
+    FastAPI still serializes it as a JSON object in the examples endpoint.
+    """
     
     category: str
     prompt: str
@@ -23,6 +29,11 @@ class IntentExamplesRegistry:
     
     _examples: Dict[str, List[str]] = {}
     
+    # Bumped on every register(); cached lists are only reused for the same version
+    _version: int = 0
+    _cached_all: Dict[Optional[str], Tuple[Tuple[int, int], List[ExamplePrompt]]] = {}
+    _cached_categories: Tuple[Tuple[int, int], List[str]] = ((-1, 0), [])
+    
     @classmethod
     def register(cls, category: str, examples: List[str]):
         """
@@ -33,6 +44,7 @@ class IntentExamplesRegistry:
             examples: List of example prompts in Portuguese
         """
         cls._examples[category] = examples
+        cls._version += 1
     
     @classmethod
     def get(cls, category: str) -> List[str]:
@@ -47,6 +59,27 @@ class IntentExamplesRegistry:
         """
         return cls._examples.get(category, [])
     
+    @classmethod
+    def iter_all(cls, category: Optional[str] = None) -> Iterator[ExamplePrompt]:
+        """
+        Lazily yield examples, optionally filtered by category.
+        ExamplePrompt objects are only built as the caller consumes them.
+        
+        Args:
+            category: Optional category filter
+            
+        Yields:
+            ExamplePrompt objects
+        """
+        if category:
+            for p in cls._examples.get(category, []):
+                yield ExamplePrompt(category=category, prompt=p)
+            return
+        
+        for cat, prompts in cls._examples.items():
+            for p in prompts:
+                yield ExamplePrompt(category=cat, prompt=p)
+    
     @classmethod
     def get_all(cls, category: Optional[str] = None) -> List[ExamplePrompt]:
         """
@@ -56,21 +89,38 @@ class IntentExamplesRegistry:
             category: Optional category filter
             
         Returns:
-            List of ExamplePrompt objects
+            List of ExamplePrompt objects (shared cached list, do not mutate)
         """
-        if category:
-            prompts = cls._examples.get(category, [])
-            return [ExamplePrompt(category=category, prompt=p) for p in prompts]
+        if category and category not in cls._examples:
+            # Not cached: the category comes from user input, so unknown
+            # values must not grow the cache
+            return []
         
-        result = []
-        for cat, prompts in cls._examples.items():
-            result.extend([ExamplePrompt(category=cat, prompt=p) for p in prompts])
+        version = cls._cache_version()
+        cached = cls._cached_all.get(category)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        # Drop entries from older versions, so only None and registered categories stay cached
+        for key in [key for key, (cached_version, _) in cls._cached_all.items() if cached_version != version]:
+            del cls._cached_all[key]
+        
+        result = list(cls.iter_all(category))
+        cls._cached_all[category] = (version, result)
         return result
     
     @classmethod
     def get_categories(cls) -> List[str]:
         """Get list of categories that have examples."""
-        return list(cls._examples.keys())
+        version = cls._cache_version()
+        if cls._cached_categories[0] != version:
+            cls._cached_categories = (version, list(cls._examples.keys()))
+        return cls._cached_categories[1]
+    
+    @classmethod
+    def _cache_version(cls) -> Tuple[int, int]:
+        """Cache key: register() counter plus identity of the storage dict (covers resets)."""
+        return (cls._version, id(cls._examples))
 
 
 def register_examples(category: str, examples: List[str]):
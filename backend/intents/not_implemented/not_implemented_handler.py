@@ -14,6 +14,10 @@ from backend.intents.base_intent import (
 )
 
 
+# Constant placeholder message returned for every not implemented intent
+_DEFAULT_MSG = "Esta funcionalidade ainda não está implementada, mas será adicionada em breve!"
+
+
 class NotImplementedQueryParams(BaseQueryParams):
     """Query parameters for not implemented intent - just captures the raw query."""
     query: str
@@ -57,7 +61,7 @@ class NotImplementedService(BaseService):
         query_text = getattr(params, 'query', 'unknown query')
         
         return NotImplementedResponse(
-            message="Esta funcionalidade ainda não está implementada, mas será adicionada em breve!",
+            message=_DEFAULT_MSG,
             query=query_text
         )
 
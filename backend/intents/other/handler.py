@@ -3,11 +3,26 @@ Other DevOps Intent Handler.
 Handles valid DevOps queries that are not yet implemented.
 """
 
+from types import MappingProxyType
 from typing import Dict, Optional
 
 from backend.intents.base_intent import BaseExtractor, BaseService, BaseIntentHandler
 
 
+# Constant catch-all payload, built once (read-only view)
+_OTHER_RESPONSE = MappingProxyType({
+    "message": "Entendo que você está perguntando sobre Azure DevOps, "
+              "mas essa funcionalidade específica ainda não está implementada. "
+              "No momento, posso ajudá-lo com:\n"
+              "- Horas trabalhadas\n"
+              "- Progresso de projetos\n"
+              "- Tarefas atrasadas\n"
+              "- Informações da equipe\n"
+              "- Atividades diárias\n\n"
+              "Essa funcionalidade será adicionada em breve!"
+})
+
+
 class OtherExtractor(BaseExtractor):
     """Placeholder extractor for not-yet-implemented DevOps queries."""
     
@@ -21,17 +36,8 @@ class OtherService(BaseService):
     
     async def query_data(self, params: Dict) -> Dict:
         """Return message for not-yet-implemented DevOps features."""
-        return {
-            "message": "Entendo que você está perguntando sobre Azure DevOps, "
-                      "mas essa funcionalidade específica ainda não está implementada. "
-                      "No momento, posso ajudá-lo com:\n"
-                      "- Horas trabalhadas\n"
-                      "- Progresso de projetos\n"
-                      "- Tarefas atrasadas\n"
-                      "- Informações da equipe\n"
-                      "- Atividades diárias\n\n"
-                      "Essa funcionalidade será adicionada em breve!"
-        }
+        # Shallow copy: the handler and memory expect a real (mutable) dict
+        return dict(_OTHER_RESPONSE)
 
 
 def create_other_handler():
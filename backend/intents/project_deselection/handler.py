@@ -3,12 +3,20 @@ Project Deselection Intent Handler.
 Clears the currently selected project from the session.
 """
 
+from types import MappingProxyType
 from typing import Dict, Optional
 
 from backend.intents.base_intent import BaseExtractor, BaseService, BaseIntentHandler
 from backend.agents.memory import get_memory
 
 
+# Constant confirmation payload, built once (read-only view)
+_DESELECTED_RESPONSE = MappingProxyType({
+    "message": "Projeto deselecionado com sucesso. Você agora pode ver informações de todos os projetos ou selecionar um novo projeto.",
+    "deselected": True
+})
+
+
 class ProjectDeselectionExtractor(BaseExtractor):
     """Extractor for project deselection - no parameters needed."""
     
@@ -21,29 +29,37 @@ class ProjectDeselectionService(BaseService):
     """Service that clears the selected project."""
     
     def __init__(self, session_id: Optional[str] = None, intent_name: Optional[str] = None):
-        """Initialize service with memory access."""
-        self.memory = get_memory()
+        """Initialize service; memory is resolved lazily on first use."""
+        self._memory = None
         self.session_id = session_id
         self.intent_name = intent_name
     
+    @property
+    def memory(self):
+        """Conversation memory, fetched on first access."""
+        if self._memory is None:
+            self._memory = get_memory()
+        return self._memory
+    
     async def query_data(self, params: Dict) -> Dict:
         """Clear project context and return confirmation message."""
         conversation_id = params.get("conversation_id")
         
-        if conversation_id:
-            # Clear project context by setting scope to 'all'
-            self.memory.update_project_context(
-                conversation_id=conversation_id,
-                project_id=None,
-                project_name=None,
-                epic_id=None,
-                scope="all"
-            )
+        # Nothing to clear without a conversation: return the constant confirmation
+        if not conversation_id:
+            return dict(_DESELECTED_RESPONSE)
+        
+        # Clear project context by setting scope to 'all'
+        self.memory.update_project_context(
+            conversation_id=conversation_id,
+            project_id=None,
+            project_name=None,
+            epic_id=None,
+            scope="all"
+        )
         
-        return {
-            "message": "Projeto deselecionado com sucesso. Você agora pode ver informações de todos os projetos ou selecionar um novo projeto.",
-            "deselected": True
-        }
+        # Shallow copy: the handler and memory expect a real (mutable) dict
+        return dict(_DESELECTED_RESPONSE)
 
 
 def create_project_deselection_handler(session_id: Optional[str] = None, intent_name: Optional[str] = None):
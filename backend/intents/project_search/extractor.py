@@ -3,7 +3,18 @@ Parameter extractor for project search intent.
 Uses LLM to extract search terms and filters from user query.
 """
 
-from typing import Optional, Dict, cast
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+
+try:
+    from instructor.core import InstructorRetryException
+except ImportError:  # older instructor releases
+    from instructor.exceptions import InstructorRetryException
 
 from backend.intents.base_intent.extractor import BaseExtractor
 from .models import ProjectSearchQuery
@@ -12,40 +23,51 @@ from .models import ProjectSearchQuery
 class ProjectSearchExtractor(BaseExtractor[ProjectSearchQuery]):
     """Extracts search terms and filters for project discovery."""
     
+    # Static rules and examples only: sent unchanged as the system message so the
+    # provider can reuse the cached prompt prefix; query/context go in the user message
+    # Field meanings live in the ProjectSearchQuery schema (sent with the tool call),
+    # so only judgement rules and examples are spelled out here
     EXTRACTION_PROMPT = """You are a parameter extraction assistant for project search.
-        Extract search terms and filters from the user's exploratory query.
-
-        Context from previous conversation:
-        {context}
+        Fill the schema from the user's exploratory query.
 
         Rules:
-        1. user_query: Preserve the exact user input
-        2. search_terms: Extract ONLY meaningful business/technical keywords
-           - Include: technology names, domains, business terms, project identifiers
-           - EXCLUDE: generic words like "projects", "projetos", "show", "list", "find"
-           - EXCLUDE classifying word like epic or epics, is a synonimous for project 
-           - Extract only terms that help filter/identify specific projects
-           - Return empty list [] if no specific search terms are found
-        3. state: OPTIONAL - Project state mapping (extract ONLY if explicitly mentioned):
-           - "Active": projetos ativos, em andamento, ativos, em execução
-           - "Closed": projetos concluídos, finalizados, fechados, terminados
-           - "New": backlog, novos, planejados, em planejamento
-           - If NO state is mentioned, return null/None
-        4. filters: Extract any additional filters (tags, etc.) if mentioned
+        - search_terms: ONLY meaningful business/technical keywords (technologies, domains,
+          business terms, project identifiers). EXCLUDE generic words like "projects",
+          "projetos", "show", "list", "find", and "epic"/"epics" (a synonym for project).
+          Return [] if there are none.
+        - state: ONLY if explicitly mentioned, otherwise null.
 
         Examples:
         - "Show me AI projects" → search_terms: ["AI"], state: null
         - "What projects use Python and ML?" → search_terms: ["Python", "ML"], state: null
-        - "List active projects" → search_terms: [], state: "Active"
         - "Find closed Delta projects" → search_terms: ["Delta"], state: "Closed"
         - "Mostre os projetos" → search_terms: [], state: null
         - "Listar projetos ativos" → search_terms: [], state: "Active"
-        - "Projetos concluídos" → search_terms: [], state: "Closed"
         - "Projetos no backlog" → search_terms: [], state: "New"
         - "Projetos com IA" → search_terms: ["IA"], state: null
-
-        User query: {query}
         """
+    
+    # Bump when EXTRACTION_PROMPT changes so cached extractions are invalidated
+    PROMPT_VERSION = "v3"
+    CACHE_TTL = 3600  # seconds
+    CACHE_MAXSIZE = 512
+    
+    # Invalid structured outputs are retried with the validation error as feedback
+    MAX_EXTRACTION_ATTEMPTS = 3
+    RETRY_BACKOFF = 1.0  # seconds, multiplied by the attempt number
+    
+    # Process-wide extraction cache: key -> (expires_at, params dump)
+    _cache: ClassVar[Dict[str, Tuple[float, Dict[str, Any]]]] = {}
+    
+    def _cache_key(self, query: str, context: Optional[Dict]) -> str:
+        """Content-addressed key over prompt version, model, normalized query and context."""
+        raw = "|".join([
+            self.PROMPT_VERSION,
+            self.azure_config.deployment_name,
+            query.strip().lower(),
+            json.dumps(context or {}, sort_keys=True, default=str),
+        ])
+        return hashlib.sha256(raw.encode()).hexdigest()
 
     async def extract_params(
         self,
@@ -65,40 +87,101 @@ class ProjectSearchExtractor(BaseExtractor[ProjectSearchQuery]):
         if self.logger:
             self.logger.info(f"Extracting search parameters from query: {query}")
         
+        cache_key = self._cache_key(query, context)
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] > time.time():
+            if self.logger:
+                self.logger.info("Search parameters served from extraction cache")
+            # Revalidate and keep the exact user input for this call
+            return ProjectSearchQuery.model_validate({**cached[1], "user_query": query})
+        
         # Format context
         context_str = "No previous context"
         if context:
             context_str = f"Previous conversation context: {context}"
             if self.logger:
-                self.logger.info(f"Using conversation context: {context}"[:150])
+                self.logger.info("Using conversation context: %.122s", context)
         
-        prompt = self.EXTRACTION_PROMPT.format(
-            context=context_str,
-            query=query
-        )
+        user_content = f"Context from previous conversation:\n{context_str}\n\nUser query: {query}"
         
         if self.logger:
             self.logger.info("Calling LLM for parameter extraction...")
         
-        # Use instructor to extract structured parameters
-        params = cast(
-            ProjectSearchQuery,
-            self.azure_config.create_chat_completion(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a parameter extraction assistant. Extract information accurately."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_model=ProjectSearchQuery
-            )
-        )
+        messages = [
+            {
+                "role": "system",
+                "content": self.EXTRACTION_PROMPT
+            },
+            {
+                "role": "user",
+                "content": user_content
+            }
+        ]
+        
+        for attempt in range(1, self.MAX_EXTRACTION_ATTEMPTS + 1):
+            try:
+                # Use instructor to extract structured parameters (sync client, run off the event loop)
+                params: ProjectSearchQuery = await asyncio.to_thread(  # type: ignore[assignment]
+                    self.azure_config.create_chat_completion,
+                    messages=messages,
+                    response_model=ProjectSearchQuery
+                )
+                break
+            except (ValidationError, InstructorRetryException) as e:
+                # instructor also wraps API/connection failures; only retry invalid outputs
+                invalid_output = isinstance(e, ValidationError) or isinstance(e.__cause__, ValidationError)
+                if not invalid_output or attempt == self.MAX_EXTRACTION_ATTEMPTS:
+                    raise
+                if self.logger:
+                    self.logger.warning(f"Invalid extraction output (attempt {attempt}), retrying: {e}")
+                messages = messages + [{
+                    "role": "user",
+                    "content": f"Your previous output had errors: {e}. Fix them and answer again."
+                }]
+                await asyncio.sleep(self.RETRY_BACKOFF * attempt)
+        
+        # Keep the exact user input regardless of how the model echoed it
+        params.user_query = query
         
         if self.logger:
-            self.logger.info(f"Extracted parameters: {params.model_dump()}")
+            self.logger.info("Extracted parameters: %s", params)
+        
+        if len(self._cache) >= self.CACHE_MAXSIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[cache_key] = (time.time() + self.CACHE_TTL, params.model_dump())
         
         return params
+    
+    async def extract_params_batch(
+        self,
+        queries: Sequence[str],
+        contexts: Optional[Sequence[Optional[Dict]]] = None,
+        concurrency: int = 10
+    ) -> List[Union[ProjectSearchQuery, BaseException]]:
+        """
+        Extract parameters for several queries concurrently.
+        
+        Args:
+            queries: User queries
+            contexts: Optional per-query conversation contexts (same length as queries)
+            concurrency: Maximum number of LLM calls in flight
+            
+        Returns:
+            One entry per query, in order: the extracted parameters, or the
+            exception raised for that query (a failure does not abort the batch)
+        """
+        if contexts is None:
+            contexts = [None] * len(queries)
+        elif len(contexts) != len(queries):
+            raise ValueError("contexts must have the same length as queries")
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract_one(query: str, context: Optional[Dict]) -> ProjectSearchQuery:
+            async with semaphore:
+                return await self.extract_params(query, context)
+        
+        return await asyncio.gather(
+            *(extract_one(query, context) for query, context in zip(queries, contexts)),
+            return_exceptions=True
+        )
@@ -26,7 +26,13 @@ class ProjectSearchQuery(BaseQueryParams):
     
     state: Optional[Literal["Active", "Closed", "New"]] = Field(
         None,
-        description="Project state filter. Optional. Must be one of: 'Active' (projetos ativos), 'Closed' (concluídos), 'New' (backlog). None if not specified."
+        description=(
+            "Project state filter, only if explicitly mentioned. "
+            "'Active': ativos, em andamento, em execução. "
+            "'Closed': concluídos, finalizados, fechados, terminados. "
+            "'New': backlog, novos, planejados, em planejamento. "
+            "None if not specified."
+        )
     )
     
     filters: Optional[Dict[str, str]] = Field(
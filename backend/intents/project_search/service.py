@@ -2,24 +2,121 @@
 Service for project search.
 """
 
-from typing import List, Optional, Dict
+import asyncio
+import heapq
+import re
+import time
+from operator import itemgetter
+from typing import AsyncIterator, ClassVar, Iterator, List, Optional, Dict, Set, Tuple
 
 from backend.intents.base_intent.service import BaseService
-from backend.models.project_models import EpicProject
+from backend.models.project_models import EpicProject, normalize_search_text
 from .models import ProjectSearchQuery, ProjectSearchResponse
 
 
+class _TermMatcher:
+    """
+    Matches all search terms at once against a project's normalized text.
+    
+    Only the best score over all terms matters, so each tier is a single
+    C-level check: a set lookup for exact names, str.startswith with a
+    tuple of prefixes, and one alternation regex for "contains". Whole-word
+    hits are answered from the project's cached token sets before scanning.
+    """
+    
+    __slots__ = ("_exact", "_prefixes", "_pattern")
+    
+    def __init__(self, terms_norm: List[str]):
+        self._exact = frozenset(terms_norm)
+        self._prefixes = tuple(terms_norm)
+        # Longest first so the alternation prefers full terms
+        self._pattern = re.compile("|".join(
+            re.escape(term) for term in sorted(self._exact, key=len, reverse=True)
+        ))
+    
+    def score(self, project: EpicProject) -> int:
+        """
+        Best score of any term against a project's name/description.
+        
+        Args:
+            project: Project to score
+            
+        Returns:
+            Relevance score (0 when no term matches)
+        """
+        name_norm = project.name_norm
+        # A term that is a whole word of the name is certainly contained in it
+        if self._exact.isdisjoint(project.name_tokens) and self._pattern.search(name_norm) is None:
+            if (not self._exact.isdisjoint(project.description_tokens)
+                    or self._pattern.search(project.description_norm) is not None):
+                return 40
+            return 0
+        if name_norm in self._exact:
+            return 100
+        if name_norm.startswith(self._prefixes):
+            return 80
+        return 60
+
+
 class ProjectSearchService(BaseService[ProjectSearchQuery, ProjectSearchResponse]):
     """Service to search and discover Epic projects from Azure DevOps."""
     
+    MAX_RESULTS = 10  # projects returned to the user
+    PROJECTS_CACHE_TTL = 60  # seconds; Epic lists change on the order of hours
+    WORK_ITEMS_BATCH_SIZE = 200  # Azure DevOps limit of ids per work items request
+    
+    # filters["state"] values accepted from callers -> WIQL state
+    _STATE_FILTERS: ClassVar[Dict[str, str]] = {"active": "Active", "closed": "Closed", "new": "New"}
+    
+    # Fetched Epic lists shared across requests: (project_id, state) -> (stored_at, projects)
+    _projects_cache: ClassVar[Dict[Tuple[str, Optional[str]], Tuple[float, List[EpicProject]]]] = {}
+    
+    # Keep references to prefetch tasks so they are not garbage collected mid-flight
+    _background_tasks: ClassVar[Set[asyncio.Task]] = set()
+    _prefetch_task: Optional[asyncio.Task] = None
+    
+    def start_prefetch(self) -> Optional[asyncio.Task]:
+        """
+        Start fetching the unfiltered Epic list while parameters are extracted.
+        Most searches have no state filter, so query_data can then reuse it.
+        """
+        if self._prefetch_task is None:
+            task = asyncio.create_task(self._fetch_all_projects(ProjectSearchQuery()))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+            # Failures are retried by the regular fetch; mark them as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._prefetch_task = task
+        return self._prefetch_task
+    
+    async def _take_prefetched(self, params: ProjectSearchQuery) -> Optional[List[EpicProject]]:
+        """Return the prefetched Epic list if it matches the query, else None."""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is None or params.state is not None:
+            # A state-filtered fetch is needed; the prefetch still warms the cache
+            return None
+        try:
+            return await task
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Projects prefetch failed, fetching again: {e}")
+            return None
+    
+    @classmethod
+    def invalidate_projects_cache(cls) -> None:
+        """Drop cached Epic lists (call after creating or updating Epics)."""
+        cls._projects_cache.clear()
+    
     def _build_wiql_query(self, params: ProjectSearchQuery) -> str:
+        state = self._escape_wiql_value(params.state)
+        area_path = self._escape_wiql_value(self.azure_config.devops_area_path, max_length=256)
         return f"""
         SELECT [System.Id], [System.Title], [System.State], [System.Description]
         FROM workitems
         WHERE [System.WorkItemType] = 'Epic'
         AND [System.TeamProject] = 'HUB GenAI'
-        AND [System.AreaPath] = 'HUB GenAI\\Projeto DELTA'
-        {f"AND [System.State] = '{params.state}'" if params.state is not None else ""}
+        AND [System.AreaPath] = '{area_path}'
+        {f"AND [System.State] = '{state}'" if state is not None else ""}
         ORDER BY [System.ChangedDate] DESC
         """
 
@@ -37,53 +134,95 @@ class ProjectSearchService(BaseService[ProjectSearchQuery, ProjectSearchResponse
         if isinstance(params, dict):
             params = ProjectSearchQuery(**params)
         
-        # Fetch all projects
-        all_projects = await self._fetch_all_projects(params)
+        top_results, total_found, search_summary = await self._search(params)
         
-        # Apply filters if specified
-        filtered_projects = all_projects#self._apply_filters(all_projects, params.filters)
+        # Format message
+        message = self._format_results(top_results, total_found, search_summary)
+        
+        return ProjectSearchResponse(
+            projects=top_results,
+            total_found=total_found,
+            search_summary=search_summary,
+            message=message
+        )
+    
+    async def query_data_stream(self, params: ProjectSearchQuery) -> AsyncIterator[str]:
+        """
+        Search for projects and yield the results message piece by piece.
+        Concatenating the chunks gives the same text as ProjectSearchResponse.message,
+        so a streaming endpoint can send the first lines as soon as ranking is done.
+        
+        Args:
+            params: Query parameters with search_terms and filters
+            
+        Yields:
+            Message chunks (the first is the summary header)
+        """
+        if isinstance(params, dict):
+            params = ProjectSearchQuery(**params)
+        
+        top_results, total_found, search_summary = await self._search(params)
+        
+        for idx, line in enumerate(self._iter_result_lines(top_results, total_found, search_summary)):
+            yield line if idx == 0 else "\n" + line
+    
+    async def _search(self, params: ProjectSearchQuery) -> Tuple[List[EpicProject], int, str]:
+        """
+        Fetch and rank projects for a query.
+        
+        Returns:
+            Tuple of (top results, total number of matches, search summary)
+        """
+        # State filters are applied server-side by the WIQL query
+        params = self._merge_state_filter(params)
+        
+        # Fetch all projects (reusing the prefetch started by the handler if it applies)
+        filtered_projects = await self._take_prefetched(params)
+        if filtered_projects is None:
+            filtered_projects = await self._fetch_all_projects(params)
         
         # Search by terms if provided
         if params.search_terms:
-            matches = self._search_by_terms(filtered_projects, params.search_terms)
-            ranked = self._rank_by_similarity(matches, params.search_terms)
+            # Only the top results get sorted; total_found still counts every match
+            scored = self._score_projects(filtered_projects, params.search_terms)
+            total_found = len(scored)
+            top_results = self._top_ranked(scored, self.MAX_RESULTS)
             search_summary = f"Searched for: {', '.join(params.search_terms)}"
         else:
             # No search terms - return all filtered projects
-            ranked = filtered_projects
+            total_found = len(filtered_projects)
+            top_results = filtered_projects[:self.MAX_RESULTS]
             search_summary = "All projects"
         
-        # Limit to top results
-        top_results = ranked[:10]
-        
-        # Format message
-        message = self._format_results(top_results, len(ranked), search_summary)
-        
-        return ProjectSearchResponse(
-            projects=top_results,
-            total_found=len(ranked),
-            search_summary=search_summary,
-            message=message
-        )
+        return top_results, total_found, search_summary
     
     async def _fetch_all_projects(self, params: ProjectSearchQuery) -> List[EpicProject]:
-        """Fetch all Epic work items (projects) from Azure DevOps."""
+        """Fetch all Epic work items (projects) from Azure DevOps, cached for PROJECTS_CACHE_TTL."""
         project_id = self.azure_config.devops_project_id
         
+        cache_key = (project_id, params.state)
+        cached = self._projects_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.PROJECTS_CACHE_TTL:
+            if self.logger:
+                self.logger.info(f"Projects served from cache ({len(cached[1])} Epics)")
+            return cached[1]
+        
         # WIQL query to get all Epic work items
         wiql_query = self._build_wiql_query(params)
         
         url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
         
         try:
-            response = self.make_request(
+            # Sync pooled session; run off the event loop so other work can proceed
+            response = await asyncio.to_thread(
+                self.make_request,
                 method="POST",
                 url=url,
                 headers=self.azure_config.get_devops_headers(),
                 json={"query": wiql_query}
             )
             
-            data = response.json()
+            data = self._decode_json(response)
             work_item_ids = [item["id"] for item in data.get("workItems", [])]
             
             if not work_item_ids:
@@ -103,6 +242,7 @@ class ProjectSearchService(BaseService[ProjectSearchQuery, ProjectSearchResponse
                         self.logger.warning(f"Failed to parse project {item.get('id')}: {e}")
                     continue
             
+            self._projects_cache[cache_key] = (time.monotonic(), projects)
             return projects
             
         except Exception as e:
@@ -115,121 +255,113 @@ class ProjectSearchService(BaseService[ProjectSearchQuery, ProjectSearchResponse
         project_id: str,
         work_item_ids: List[int]
     ) -> List[Dict]:
-        """Get detailed information for work items."""
-        ids_str = ",".join(str(id) for id in work_item_ids[:200])
-        url = self.azure_config.get_devops_url(project_id) + f"/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
+        """
+        Get detailed information for work items.
+        The API accepts at most WORK_ITEMS_BATCH_SIZE ids per call, so ids are
+        split into batches that are requested concurrently.
+        """
+        base_url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/workitems"
+        headers = self.azure_config.get_devops_headers()
+        batch_size = self.WORK_ITEMS_BATCH_SIZE
         
-        response = self.make_request(
-            method="GET",
-            url=url,
-            headers=self.azure_config.get_devops_headers()
-        )
+        responses = await asyncio.gather(*(
+            asyncio.to_thread(
+                self.make_request,
+                method="GET",
+                url=f"{base_url}?ids={','.join(map(str, work_item_ids[i:i + batch_size]))}&api-version=7.1",
+                headers=headers
+            )
+            for i in range(0, len(work_item_ids), batch_size)
+        ))
         
-        return response.json().get("value", [])
+        return [item for response in responses for item in self._decode_json(response).get("value", [])]
     
-    def _apply_filters(
-        self,
-        projects: List[EpicProject],
-        filters: Optional[Dict[str, str]]
-    ) -> List[EpicProject]:
-        """Apply state/status filters to project list."""
-        if not filters:
-            return projects
-        
-        filtered = projects
+    def _merge_state_filter(self, params: ProjectSearchQuery) -> ProjectSearchQuery:
+        """
+        Fold a state given in filters into params.state so it is applied by the
+        WIQL query instead of fetching every Epic and filtering afterwards.
         
-        # Filter by state if specified
-        if "state" in filters:
-            state_filter = filters["state"].lower()
-            if state_filter in ["active", "closed"]:
-                filtered = [
-                    p for p in filtered
-                    if p.state and p.state.lower() == state_filter
-                ]
+        Args:
+            params: Query parameters
+            
+        Returns:
+            Params with state set from filters["state"] when it names a known state
+        """
+        if params.state is not None or not params.filters or "state" not in params.filters:
+            return params
         
-        return filtered
+        state = self._STATE_FILTERS.get(str(params.filters["state"]).strip().lower())
+        if state is None:
+            return params
+        return params.model_copy(update={"state": state})
     
-    def _search_by_terms(
+    def _score_projects(
         self,
         projects: List[EpicProject],
         search_terms: List[str]
-    ) -> List[EpicProject]:
+    ) -> List[Tuple[EpicProject, int]]:
         """
-        Search projects by keywords in name and description.
-        Returns projects matching any search term.
-        """
-        if not search_terms:
-            return projects
+        Score projects by relevance to search terms in a single pass.
+        Projects matching no term (score 0) are dropped.
         
-        terms_lower = [term.lower() for term in search_terms]
-        matches = []
+        Scoring:
+        - 100: Exact match in name
+        - 80: Name starts with term
+        - 60: Term in name
+        - 40: Term in description
         
-        for project in projects:
-            name_lower = project.name.lower() if project.name else ""
-            desc_lower = project.description.lower() if project.description else ""
+        Args:
+            projects: Candidate projects
+            search_terms: Search keywords
             
-            # Check if any search term appears in name or description
-            for term in terms_lower:
-                if term in name_lower or term in desc_lower:
-                    matches.append(project)
-                    break  # Only add once per project
-        
-        return matches
+        Returns:
+            (project, score) pairs in input order
+        """
+        # Bind the scorer once; the comprehension keeps the per-project loop tight
+        score = _TermMatcher([normalize_search_text(term) for term in search_terms]).score
+        return [
+            (project, max_score)
+            for project in projects
+            if (max_score := score(project)) > 0
+        ]
+    
+    @staticmethod
+    def _top_ranked(
+        scored: List[Tuple[EpicProject, int]],
+        limit: Optional[int] = None
+    ) -> List[EpicProject]:
+        """
+        Order scored projects by score descending (ties keep input order).
+        With a limit, only the top-K are selected instead of sorting everything.
+        """
+        if limit is None:
+            ranked = sorted(scored, key=itemgetter(1), reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scored, key=itemgetter(1))
+        return [p for p, _ in ranked]
     
     def _rank_by_similarity(
         self,
         projects: List[EpicProject],
-        search_terms: List[str]
+        search_terms: List[str],
+        limit: Optional[int] = None
     ) -> List[EpicProject]:
         """
-        Rank projects by relevance to search terms.
+        Rank projects by relevance to search terms, dropping non-matches.
+        See _score_projects for the scoring rules.
         
-        Scoring:
-        - 100: Exact match in name
-        - 80: Name starts with term
-        - 60: Term in name
-        - 40: Term in description
-        - 20: Partial word match
+        Args:
+            projects: Candidate projects
+            search_terms: Search keywords
+            limit: Optional maximum number of projects returned
+            
+        Returns:
+            Matching projects, most relevant first
         """
         if not search_terms:
-            return projects
-        
-        terms_lower = [term.lower() for term in search_terms]
-        scored = []
-        
-        for project in projects:
-            name_lower = project.name.lower() if project.name else ""
-            desc_lower = project.description.lower() if project.description else ""
-            max_score = 0
-            
-            for term in terms_lower:
-                score = 0
-                
-                # Name exact match
-                if name_lower == term:
-                    score = 100
-                # Name starts with term
-                elif name_lower.startswith(term):
-                    score = 80
-                # Term in name
-                elif term in name_lower:
-                    score = 60
-                # Term in description
-                elif term in desc_lower:
-                    score = 40
-                # Partial word match
-                else:
-                    words = name_lower.split()
-                    if any(word.startswith(term) or term in word for word in words):
-                        score = 20
-                
-                max_score = max(max_score, score)
-            
-            scored.append((project, max_score))
+            return projects[:limit]
         
-        # Sort by score descending
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return [p for p, _ in scored]
+        return self._top_ranked(self._score_projects(projects, search_terms), limit)
     
     def _format_results(
         self,
@@ -238,21 +370,29 @@ class ProjectSearchService(BaseService[ProjectSearchQuery, ProjectSearchResponse
         search_summary: str
     ) -> str:
         """Format search results for presentation."""
+        return "\n".join(self._iter_result_lines(projects, total_found, search_summary))
+    
+    def _iter_result_lines(
+        self,
+        projects: List[EpicProject],
+        total_found: int,
+        search_summary: str
+    ) -> Iterator[str]:
+        """Yield the lines of the results message in display order."""
         if not projects:
-            return f"No projects found matching your search.\n\n{search_summary}"
+            yield f"No projects found matching your search.\n\n{search_summary}"
+            return
         
-        lines = [f"Found {total_found} project(s). Showing top {len(projects)}:\n"]
+        yield f"Found {total_found} project(s). Showing top {len(projects)}:\n"
         
         for idx, project in enumerate(projects, 1):
             state_emoji = "🟢" if project.state == "Active" else "🔴"
-            lines.append(f"{idx}. {state_emoji} {project.name}")
+            yield f"{idx}. {state_emoji} {project.name}"
             if project.description:
                 # Truncate long descriptions
                 desc = project.description[:100]
                 if len(project.description) > 100:
                     desc += "..."
-                lines.append(f"   {desc}")
-        
-        lines.append(f"\n{search_summary}")
+                yield f"   {desc}"
         
-        return "\n".join(lines)
+        yield f"\n{search_summary}"
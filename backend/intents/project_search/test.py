@@ -2,8 +2,10 @@
 Tests for project search intent.
 """
 
+import json
 import pytest
-from unittest.mock import patch
+from pydantic import ValidationError
+from unittest.mock import Mock, patch
 from backend.intents.project_search.models import ProjectSearchQuery, ProjectSearchResponse
 from backend.intents.project_search.service import ProjectSearchService
 from backend.intents.project_search.extractor import ProjectSearchExtractor
@@ -87,6 +89,58 @@ class TestProjectSearchExtractor:
         
         # Should return empty search terms
         assert isinstance(params.search_terms, list)
+    
+    @pytest.mark.asyncio
+    async def test_extract_uses_cache_for_repeated_query(self, extractor):
+        """Test repeated queries are served from the extraction cache."""
+        ProjectSearchExtractor._cache.clear()
+        extracted = ProjectSearchQuery(user_query="Projetos com IA", search_terms=["IA"])
+        
+        with patch.object(extractor.azure_config, "create_chat_completion", return_value=extracted) as llm:
+            first = await extractor.extract_params("Projetos com IA")
+            second = await extractor.extract_params("  projetos com ia ")
+        
+        llm.assert_called_once()
+        assert first.search_terms == second.search_terms == ["IA"]
+        assert second.user_query == "  projetos com ia "
+
+
+    @pytest.mark.asyncio
+    async def test_extract_params_batch_keeps_order_and_errors(self, extractor):
+        """Test batch extraction returns results in order and isolates failures."""
+        ProjectSearchExtractor._cache.clear()
+        
+        def fake_llm(messages, response_model):
+            query = messages[1]["content"].rsplit("User query: ", 1)[1]
+            if query == "falha":
+                raise RuntimeError("LLM indisponível")
+            return ProjectSearchQuery(user_query=query, search_terms=[query])
+        
+        with patch.object(extractor.azure_config, "create_chat_completion", side_effect=fake_llm):
+            results = await extractor.extract_params_batch(["IA", "falha", "Python"], concurrency=2)
+        
+        assert [r.search_terms for r in (results[0], results[2])] == [["IA"], ["Python"]]
+        assert isinstance(results[1], RuntimeError)
+
+
+    @pytest.mark.asyncio
+    async def test_extract_retries_with_validation_feedback(self, extractor):
+        """Test an invalid LLM output is retried with the error appended."""
+        ProjectSearchExtractor._cache.clear()
+        with pytest.raises(ValidationError) as invalid:
+            ProjectSearchQuery.model_validate({"state": "Bogus"})
+        extracted = ProjectSearchQuery(user_query="Projetos ativos", state="Active")
+        
+        with patch.object(extractor, "RETRY_BACKOFF", 0), \
+                patch.object(extractor.azure_config, "create_chat_completion",
+                             side_effect=[invalid.value, extracted]) as llm:
+            params = await extractor.extract_params("Projetos ativos")
+        
+        assert params.state == "Active"
+        assert llm.call_count == 2
+        retry_messages = llm.call_args.kwargs["messages"]
+        assert len(retry_messages) == 3
+        assert "previous output had errors" in retry_messages[-1]["content"]
 
 
 class TestProjectSearchService:
@@ -94,7 +148,7 @@ class TestProjectSearchService:
     
     def test_search_by_terms_single(self, service, mock_projects):
         """Test searching by single keyword."""
-        matches = service._search_by_terms(mock_projects, ["AI"])
+        matches = service._rank_by_similarity(mock_projects, ["AI"])
         
         # Should find Gen AI and AI Research
         assert len(matches) >= 2
@@ -103,7 +157,7 @@ class TestProjectSearchService:
     
     def test_search_by_terms_multiple(self, service, mock_projects):
         """Test searching by multiple keywords."""
-        matches = service._search_by_terms(mock_projects, ["Python", "AI"])
+        matches = service._rank_by_similarity(mock_projects, ["Python", "AI"])
         
         # Should find projects with Python or AI
         assert len(matches) >= 3
@@ -113,7 +167,7 @@ class TestProjectSearchService:
     
     def test_search_by_terms_in_description(self, service, mock_projects):
         """Test searching in description."""
-        matches = service._search_by_terms(mock_projects, ["FastAPI"])
+        matches = service._rank_by_similarity(mock_projects, ["FastAPI"])
         
         # Should find Delta Platform which has FastAPI in description
         assert len(matches) >= 1
@@ -121,43 +175,53 @@ class TestProjectSearchService:
     
     def test_search_no_matches(self, service, mock_projects):
         """Test searching with no matches."""
-        matches = service._search_by_terms(mock_projects, ["XYZ123"])
+        matches = service._rank_by_similarity(mock_projects, ["XYZ123"])
         
         assert len(matches) == 0
     
-    def test_apply_filters_active(self, service, mock_projects):
-        """Test filtering by active state."""
-        filtered = service._apply_filters(mock_projects, {"state": "active"})
-        
-        # Should exclude closed projects
-        assert len(filtered) < len(mock_projects)
-        assert all(p.state == "Active" for p in filtered)
-        assert not any(p.name == "Legacy System" for p in filtered)
+    def test_merge_state_filter_active(self, service):
+        """Test filters["state"] is moved into params.state for the WIQL query."""
+        params = service._merge_state_filter(ProjectSearchQuery(filters={"state": "active"}))
+        
+        assert params.state == "Active"
+        assert "[System.State] = 'Active'" in service._build_wiql_query(params)
     
-    def test_apply_filters_closed(self, service, mock_projects):
-        """Test filtering by closed state."""
-        filtered = service._apply_filters(mock_projects, {"state": "closed"})
-        
-        # Should only include closed projects
-        assert len(filtered) >= 1
-        assert all(p.state == "Closed" for p in filtered)
-        assert any(p.name == "Legacy System" for p in filtered)
+    def test_build_wiql_query_uses_configured_area_path(self, service):
+        """Test the area path comes from the config and is quote-escaped."""
+        with patch.object(service.azure_config, "devops_area_path", "Team\\O'Neil"):
+            query = service._build_wiql_query(ProjectSearchQuery())
+        
+        assert "[System.AreaPath] = 'Team\\O''Neil'" in query
     
-    def test_apply_filters_none(self, service, mock_projects):
-        """Test no filters returns all projects."""
-        filtered = service._apply_filters(mock_projects, None)
+    def test_merge_state_filter_keeps_explicit_state(self, service):
+        """Test an extracted state wins over filters and unknown states are ignored."""
+        params = ProjectSearchQuery(state="New", filters={"state": "closed"})
         
-        assert len(filtered) == len(mock_projects)
+        assert service._merge_state_filter(params).state == "New"
+        assert service._merge_state_filter(ProjectSearchQuery(filters={"state": "bogus"})).state is None
+    
+    def test_merge_state_filter_none(self, service):
+        """Test no filters leaves params unchanged."""
+        params = ProjectSearchQuery(filters=None)
+        
+        assert service._merge_state_filter(params) is params
     
     def test_rank_by_similarity(self, service, mock_projects):
         """Test ranking by similarity."""
-        matches = service._search_by_terms(mock_projects, ["AI"])
-        ranked = service._rank_by_similarity(matches, ["AI"])
+        ranked = service._rank_by_similarity(mock_projects, ["AI"])
         
         # Should be sorted by relevance
         assert len(ranked) >= 2
         # Projects with AI in name should rank higher
-        assert ranked[0] is not None
+        assert ranked[0].name == "AI Research"
+    
+    def test_rank_by_similarity_ignores_accents_and_case(self, service):
+        """Test Portuguese accents and case do not prevent a match."""
+        projects = [EpicProject(id="1", name="Migração São Paulo"), EpicProject(id="2", name="Outro")]
+        
+        ranked = service._rank_by_similarity(projects, ["SAO PAULO", "migracao"])
+        
+        assert [p.id for p in ranked] == ["1"]
     
     def test_format_results_with_projects(self, service, mock_projects):
         """Test formatting results message."""
@@ -192,10 +256,91 @@ class TestProjectSearchService:
             assert "AI" in response.search_summary
             assert response.message is not None
     
+    @pytest.mark.asyncio
+    async def test_search_reports_total_beyond_top_results(self, service):
+        """Test only the top results are returned while total_found counts every match."""
+        projects = [EpicProject(id=str(i), name=f"Data {i}", state="Active") for i in range(15)]
+        projects.append(EpicProject(id="99", name="data", state="Active"))
+        with patch.object(service, '_fetch_all_projects', return_value=projects):
+            params = ProjectSearchQuery(user_query="data", search_terms=["data"])
+            response = await service.query_data(params)
+        
+        assert response.total_found == 16
+        assert len(response.projects) == service.MAX_RESULTS
+        assert response.projects[0].id == "99"
+        # Ties keep catalog order
+        assert [p.id for p in response.projects[1:]] == [str(i) for i in range(9)]
+    
+    @pytest.mark.asyncio
+    async def test_fetch_all_projects_cached_by_state(self, service):
+        """Test Epic lists are fetched once per state until the cache is invalidated."""
+        ProjectSearchService.invalidate_projects_cache()
+        wiql = {"workItems": [{"id": 7}]}
+        details = {"value": [{"id": 7, "fields": {"System.Title": "Gen AI", "System.State": "Active"}}]}
+        
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.content = json.dumps(wiql if "/wiql" in url else details).encode()
+            return response
+        
+        with patch.object(service._session, "request", side_effect=fake_request) as request:
+            first = await service._fetch_all_projects(ProjectSearchQuery(user_query="q"))
+            second = await service._fetch_all_projects(ProjectSearchQuery(user_query="q2"))
+            assert request.call_count == 2
+            assert [p.name for p in second] == [p.name for p in first] == ["Gen AI"]
+            
+            await service._fetch_all_projects(ProjectSearchQuery(user_query="q", state="Active"))
+            assert request.call_count == 4
+            
+            ProjectSearchService.invalidate_projects_cache()
+            await service._fetch_all_projects(ProjectSearchQuery(user_query="q"))
+            assert request.call_count == 6
+    
+    @pytest.mark.asyncio
+    async def test_get_work_item_details_batches_ids(self, service):
+        """Test more than 200 ids are fetched in batches instead of truncated."""
+        def fake_request(method, url, **kwargs):
+            ids = url.split("ids=")[1].split("&")[0].split(",")
+            response = Mock(status_code=200)
+            response.content = json.dumps({"value": [{"id": int(i)} for i in ids]}).encode()
+            return response
+        
+        with patch.object(service._session, "request", side_effect=fake_request) as request:
+            items = await service._get_work_item_details("p", list(range(450)))
+        
+        assert request.call_count == 3
+        assert [item["id"] for item in items] == list(range(450))
+    
+    @pytest.mark.asyncio
+    async def test_query_data_reuses_prefetch(self, service, mock_projects):
+        """Test the unfiltered prefetch is reused, and skipped for state-filtered queries."""
+        with patch.object(service, '_fetch_all_projects', return_value=mock_projects) as fetch:
+            service.start_prefetch()
+            response = await service.query_data(ProjectSearchQuery(user_query="q", search_terms=["AI"]))
+            assert fetch.call_count == 1
+            assert response.total_found >= 2
+            
+            service.start_prefetch()
+            await service.query_data(ProjectSearchQuery(user_query="q", state="Active"))
+            assert fetch.call_count == 3
+            assert fetch.call_args.args[0].state == "Active"
+    
+    @pytest.mark.asyncio
+    async def test_query_data_stream_matches_message(self, service, mock_projects):
+        """Test streamed chunks concatenate to the non-streamed message."""
+        params = ProjectSearchQuery(user_query="q", search_terms=["AI"])
+        with patch.object(service, '_fetch_all_projects', return_value=mock_projects):
+            response = await service.query_data(params)
+            chunks = [chunk async for chunk in service.query_data_stream(params)]
+        
+        assert chunks[0].startswith(f"Found {response.total_found} project(s)")
+        assert "".join(chunks) == response.message
+    
     @pytest.mark.asyncio
     async def test_search_with_filters(self, service, mock_projects):
         """Test search with state filter."""
-        with patch.object(service, '_fetch_all_projects', return_value=mock_projects):
+        active = [p for p in mock_projects if p.state == "Active"]
+        with patch.object(service, '_fetch_all_projects', return_value=active) as fetch:
             params = ProjectSearchQuery(
                 user_query="List active projects",
                 search_terms=[],
@@ -204,7 +349,8 @@ class TestProjectSearchService:
             response = await service.query_data(params)
             
             assert isinstance(response, ProjectSearchResponse)
-            # Should exclude closed projects
+            # The state filter is pushed down to the WIQL fetch
+            assert fetch.call_args.args[0].state == "Active"
             assert not any(p.name == "Legacy System" for p in response.projects)
     
     @pytest.mark.asyncio
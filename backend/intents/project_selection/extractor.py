@@ -3,12 +3,55 @@ Parameter extractor for project selection intent.
 Uses LLM to extract specific project name from user query.
 """
 
-from typing import Optional, Dict, cast
+import random
+import re
+import time
+from typing import ClassVar, Optional, Dict, Tuple, cast
 
 from backend.intents.base_intent.extractor import BaseExtractor
+from backend.models.project_models import normalize_search_text
 from .models import ProjectSelectionQuery
 
 
+# Deterministic fast path for the common "<verb> [project] <name>" phrasing,
+# e.g. "Select Delta", "selecionar o projeto Gen AI", "quero usar Delta"
+_SELECT_PATTERN = re.compile(
+    r"^\s*(?:quero\s+)?"
+    r"(?:select|choose|pick|use|open|switch\s+to|go\s+to|work\s+on|"
+    r"selecionar|selecione|seleciona|escolher|escolha|escolho|usar|use|abrir|abra|"
+    r"trocar\s+para|mudar\s+para|trabalhar\s+(?:no|com\s+o))\s+"
+    r"(?:(?:the\s+)?project\s+|(?:o\s+)?projeto\s+)?"
+    r"(?:(?:number|n[uú]mero)\s+|\#\s*)?"
+    r"(?P<name>[\w\s\-\.]+?)"
+    r"(?:\s+(?:project|projeto))?\s*[.!]?\s*$",
+    re.IGNORECASE
+)
+
+# Leading article dropped from the captured name ("select the Delta project" -> "Delta")
+_LEADING_ARTICLE = re.compile(r"^(?:the|o|a|os|as)\s+", re.IGNORECASE)
+
+# Names that refer back to the conversation ("the second one") need the LLM and context;
+# matched after dropping the leading article and a trailing "one"
+_CONTEXTUAL_NAMES = frozenset({
+    "it", "this", "that", "one", "first", "second", "third", "fourth", "fifth", "last",
+    "1st", "2nd", "3rd", "4th", "5th", "previous", "next", "same",
+    "ele", "ela", "esse", "essa", "este", "esta", "isso", "mesmo", "mesma", "anterior",
+    "primeiro", "segundo", "terceiro", "quarto", "quinto", "ultimo", "proximo",
+    "primeira", "segunda", "terceira", "quarta", "quinta", "ultima", "proxima",
+    "1o", "2o", "3o", "1a", "2a", "3a",
+})
+
+# Filler words dropped when canonicalizing a query for the extraction cache, so
+# "Open Delta", "let's use Delta" and "quero trocar para o projeto Delta" share a key
+_FILLER_WORDS = frozenset({
+    "i", "d", "ll", "m", "s", "want", "would", "like", "to", "let", "lets", "us", "please", "the",
+    "project", "projects", "select", "choose", "pick", "use", "open", "switch", "go", "work", "on",
+    "eu", "quero", "gostaria", "de", "vamos", "por", "favor", "o", "a", "no", "na", "com", "para",
+    "projeto", "projetos", "selecionar", "selecione", "seleciona", "escolher", "escolha", "escolho",
+    "usar", "abrir", "abra", "trocar", "mudar", "trabalhar",
+})
+
+
 class ProjectSelectionExtractor(BaseExtractor[ProjectSelectionQuery]):
     """Extracts specific project name for selection."""
     
@@ -33,6 +76,55 @@ class ProjectSelectionExtractor(BaseExtractor[ProjectSelectionQuery]):
         User query: {query}
         """
 
+    FAST_PATH_LOG_SAMPLE = 0.01  # fraction of fast-path hits logged
+    
+    CACHE_TTL = 3600  # seconds
+    CACHE_MAXSIZE = 512
+    
+    # Process-wide extraction cache: canonical query -> (expires_at, project name).
+    # Only the name is stored; the rest of ProjectSelectionQuery is rebuilt per call
+    _cache: ClassVar[Dict[str, Tuple[float, str]]] = {}
+    
+    @staticmethod
+    def _cache_key(query: str) -> Optional[str]:
+        """
+        Canonical form of a query: normalized words minus selection filler words.
+        Phrasings that only differ in wording around the project name share a key.
+        
+        Returns:
+            Cache key, or None if nothing but filler words remain
+        """
+        words = [w for w in re.findall(r"\w+", normalize_search_text(query)) if w not in _FILLER_WORDS]
+        return " ".join(words) or None
+    
+    @staticmethod
+    def _is_contextual(name: str) -> bool:
+        """Whether a captured name refers back to the conversation ("second one", "a última")."""
+        words = normalize_search_text(name).split()  # NFKD folds "2º" to "2o"
+        if len(words) > 1 and words[-1] == "one":
+            words.pop()
+        return " ".join(words) in _CONTEXTUAL_NAMES
+    
+    def _match_fast_path(self, query: str) -> Optional[ProjectSelectionQuery]:
+        """
+        Extract the project name without the LLM when the query follows the
+        simple "<verb> [project] <name>" grammar.
+        
+        Args:
+            query: User query
+            
+        Returns:
+            ProjectSelectionQuery, or None when the LLM is needed
+        """
+        match = _SELECT_PATTERN.match(query)
+        if match is None:
+            return None
+        
+        name = _LEADING_ARTICLE.sub("", " ".join(match.group("name").split()))
+        if not name or self._is_contextual(name):
+            return None
+        return ProjectSelectionQuery(user_query=query, project_name=name)
+
     async def extract_params(
         self,
         query: str,
@@ -51,14 +143,28 @@ class ProjectSelectionExtractor(BaseExtractor[ProjectSelectionQuery]):
         if self.logger:
             self.logger.info(f"Extracting project name from query: {query}")
         
+        params = self._match_fast_path(query)
+        if params is not None:
+            # Sample fast-path hits so their quality can be monitored
+            if self.logger and random.random() < self.FAST_PATH_LOG_SAMPLE:
+                self.logger.info("Fast-path extraction (no LLM): %r -> %r", query, params.project_name)
+            return params
+        
+        cache_key = self._cache_key(query)
+        cached = self._cache.get(cache_key) if cache_key else None
+        if cached is not None and cached[0] > time.time():
+            if self.logger:
+                self.logger.info("Project name served from extraction cache")
+            return ProjectSelectionQuery(user_query=query, project_name=cached[1])
+        
         # Format context
         context_str = "No previous context"
         if context:
             context_str = f"Previous conversation context: {context}"
             if self.logger:
-                self.logger.info(f"Using conversation context: {context}"[:150])
+                self.logger.info("Using conversation context: %.122s", context)
         
-        prompt = self.EXTRACTION_PROMPT.format(
+        prompt = self._render_prompt(
             context=context_str,
             query=query
         )
@@ -87,6 +193,13 @@ class ProjectSelectionExtractor(BaseExtractor[ProjectSelectionQuery]):
         )
         
         if self.logger:
-            self.logger.info(f"Parameters extracted successfully: {params.model_dump()}")
+            self.logger.info("Parameters extracted successfully: %s", params)
+        
+        # Only cache names read from the query itself, not resolved from context
+        if cache_key and params.project_name and \
+                normalize_search_text(params.project_name) in normalize_search_text(query):
+            if len(self._cache) >= self.CACHE_MAXSIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[cache_key] = (time.time() + self.CACHE_TTL, params.project_name)
         
         return params
@@ -2,17 +2,151 @@
 Service for project selection.
 """
 
-from typing import List, Optional, Dict
+import asyncio
+import heapq
+import json
+import time
+from bisect import bisect_right
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import accumulate, islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, ClassVar, List, Optional, Dict, Set, Tuple
 
 from backend.intents.base_intent.service import BaseService
-from backend.models.project_models import EpicProject
+from backend.models.project_models import EpicProject, normalize_search_text
 from backend.agents.memory import get_memory
 from .models import ProjectSelectionQuery, ProjectSelectionResponse
 
+if TYPE_CHECKING:
+    from backend.intents.project_search.service import ProjectSearchService
+
+
+# Epic lists shared across requests: (devops project id, area path) -> (stored_at, projects)
+_PROJECT_CACHE: Dict[Tuple[str, str], Tuple[float, List[EpicProject]]] = {}
+_PROJECT_CACHE_TTL = 60  # seconds
+
+_WIQL_PATH = "/_apis/wit/wiql?api-version=7.1"
+# WIQL query to get all Epic work items of an area path
+_EPIC_WIQL = """
+        SELECT [System.Id], [System.Title], [System.State], [System.Description]
+        FROM workitems
+        WHERE [System.WorkItemType] = 'Epic'
+        AND [System.TeamProject] = 'HUB GenAI'
+        AND [System.AreaPath] = '{area_path}'
+        ORDER BY [System.ChangedDate] DESC
+        """
+
+
+
+class _NameIndex:
+    """
+    Normalized Epic names packed into one NUL-separated string, so scoring a
+    term is a few C-level str.find scans over the whole list instead of a
+    Python loop with several string tests per project.
+    """
+    
+    __slots__ = ("projects", "_names", "_blob", "_starts")
+    
+    def __init__(self, projects: List[EpicProject]):
+        self.projects = projects
+        self._names = [project.name_norm for project in projects]
+        self._blob = "\0" + "\0".join(self._names) + "\0"
+        # Offset in _blob where each name starts (names are preceded by a NUL)
+        self._starts = list(accumulate((len(name) + 1 for name in self._names), initial=1))
+    
+    def score(self, term_norm: str, search_words: Tuple[str, ...]) -> Dict[int, int]:
+        """
+        Score every name against a normalized term; see _score_candidates for the scale.
+        
+        Returns:
+            Project index -> score, for matching projects only
+        """
+        if not term_norm:
+            return {i: 100 if not name else 80 for i, name in enumerate(self._names)}
+        
+        blob, starts = self._blob, self._starts
+        scores: Dict[int, int] = {}
+        
+        # The first hit inside a name is its leftmost one, which decides the score
+        end = len(term_norm)
+        pos = blob.find(term_norm)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            if pos == starts[i]:
+                scores[i] = 100 if blob[pos + end] == "\0" else 80
+            else:
+                scores[i] = 60
+            pos = blob.find(term_norm, starts[i + 1])
+        
+        # Names starting with a word of the term ("\0word" only matches at a name start)
+        for word in search_words:
+            pos = blob.find("\0" + word)
+            while pos != -1:
+                i = bisect_right(starts, pos + 1) - 1
+                scores.setdefault(i, 40)
+                pos = blob.find("\0" + word, pos + 1)
+        
+        return scores
+
+
+# Index of the last scored Epic list, reused while the same cached list is served
+_NAME_INDEX: Optional[_NameIndex] = None
+
+
+def _name_index(projects: List[EpicProject]) -> _NameIndex:
+    """Get the packed name index of an Epic list, building it on first use."""
+    global _NAME_INDEX
+    index = _NAME_INDEX
+    if index is None or index.projects is not projects:
+        index = _NAME_INDEX = _NameIndex(projects)
+    return index
 
 class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectionResponse]):
     """Service to select specific Epic project from Azure DevOps."""
     
+    # Number of similarly named Epics recorded as likely next selections
+    SIBLING_PREFETCH_LIMIT = 3
+    # Scores at or above this mean the name contains the requested term
+    MATCH_MIN_SCORE = 60
+    # Candidates listed when the name is ambiguous
+    MAX_AMBIGUOUS_RESULTS = 10
+    # Name lookups stop after this many hits; more cannot be disambiguated by the user
+    MAX_NAME_MATCHES = 25
+    # Minimum difflib similarity (0-1) for typo suggestions
+    FUZZY_CUTOFF = 0.75
+    MAX_FUZZY_SUGGESTIONS = 5
+    WORK_ITEMS_BATCH_SIZE = 200  # Azure DevOps limit of ids per work items request
+    
+    # Keep references to prefetch tasks so they are not garbage collected mid-flight
+    _background_tasks: ClassVar[Set[asyncio.Task]] = set()
+    _prefetch_task: Optional[asyncio.Task] = None
+    # Created on the first search fallback and reused for this service instance
+    _search_service: Optional["ProjectSearchService"] = None
+    
+    def start_prefetch(self) -> Optional[asyncio.Task]:
+        """Warm the Epic list while the project name is being extracted."""
+        if self._prefetch_task is None:
+            task = asyncio.create_task(self._fetch_all_projects())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+            # Failures are retried by the regular fetch; mark them as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._prefetch_task = task
+        return self._prefetch_task
+    
+    async def _take_prefetched(self) -> Optional[List[EpicProject]]:
+        """Return the Epic list fetched by start_prefetch, or None if unavailable."""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Projects prefetch failed, fetching again: {e}")
+            return None
+    
     async def query_data(self, params: ProjectSelectionQuery) -> ProjectSelectionResponse:
         """
         Select a specific project by name.
@@ -36,16 +170,27 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
                 message="Você está tentando selecionar um projeto, mas não consegui identificar qual projeto você quer selecionar. Por favor, especifique o nome ou número do projeto que deseja trabalhar."
             )
         
-        # Fetch all projects
-        all_projects = await self._fetch_all_projects()
+        # Fetch all projects (reusing the prefetch started by the handler if any)
+        all_projects = await self._take_prefetched()
+        if all_projects is None:
+            all_projects = await self._fetch_all_projects()
+        
+        # Score every project once; names containing the term (score >= 60) are matches
+        scored = self._score_candidates(all_projects, params.project_name)
         
-        # Find matches by name
-        matches = self._find_project_by_name(all_projects, params.project_name)
+        matches = [(p, score) for p, score in scored if score >= self.MATCH_MIN_SCORE]
+        # An exact name match wins outright, even if other names contain it
+        exact = next((p for p, score in matches if score == 100), None)
         
-        # CASE 1: Single match - auto-select
-        if len(matches) == 1:
-            selected = matches[0]
-            self._update_project_context(selected)
+        # CASE 1: Exact or single match - auto-select
+        if exact is not None or len(matches) == 1:
+            selected = exact or matches[0][0]
+            # Closest other Epics by name are the likely next selections
+            siblings = [
+                p for p in self._top_k(scored, self.SIBLING_PREFETCH_LIMIT + 1)
+                if p.id != selected.id
+            ][:self.SIBLING_PREFETCH_LIMIT]
+            self._update_project_context(selected, siblings)
             
             return ProjectSelectionResponse(
                 selected=True,
@@ -58,6 +203,9 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
         # CASE 2: No matches - fallback to search
         if len(matches) == 0:
             suggestions = await self._fallback_to_search(params.project_name)
+            if not suggestions:
+                # Likely a typo in the name: suggest close spellings
+                suggestions = self._fuzzy_candidates(all_projects, params.project_name) or None
             
             if suggestions:
                 return ProjectSelectionResponse(
@@ -76,18 +224,20 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
                     message=f"Project '{params.project_name}' not found."
                 )
         
-        # CASE 3: Multiple matches - ask for clarification
-        ranked = self._rank_by_similarity(matches, params.project_name)
-        
+        # CASE 3: Multiple matches - ask for clarification with the best ones
         return ProjectSelectionResponse(
             selected=False,
             selected_project=None,
-            ambiguous_projects=ranked,
+            ambiguous_projects=self._top_k(matches, self.MAX_AMBIGUOUS_RESULTS),
             suggested_projects=None,
-            message=f"Found {len(ranked)} projects matching '{params.project_name}'. Please specify which one."
+            message=f"Found {len(matches)} projects matching '{params.project_name}'. Please specify which one."
         )
     
-    def _update_project_context(self, project: EpicProject) -> None:
+    def _update_project_context(
+        self,
+        project: EpicProject,
+        siblings: Optional[List[EpicProject]] = None
+    ) -> None:
         """Update memory with selected project context."""
         if self.session_id:
             memory = get_memory()
@@ -95,7 +245,8 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
                 self.session_id,
                 project.id,
                 project.name,
-                epic_id=int(project.id) if project.id else None
+                epic_id=int(project.id) if project.id else None,
+                siblings=[int(p.id) for p in siblings or [] if p.id]
             )
     
     async def _fallback_to_search(self, project_name: str) -> Optional[List[EpicProject]]:
@@ -114,11 +265,12 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
         from backend.intents.project_search.models import ProjectSearchQuery
         
         try:
-            # Create search service instance
-            search_service = ProjectSearchService(
-                session_id=self.session_id,
-                intent_name="project_search"
-            )
+            if self._search_service is None:
+                self._search_service = ProjectSearchService(
+                    session_id=self.session_id,
+                    intent_name="project_search"
+                )
+            search_service = self._search_service
             
             # Create search query with project name as search term
             search_query = ProjectSearchQuery(
@@ -142,31 +294,46 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
                 self.logger.warning(f"Fallback search failed: {e}")
             return None
     
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _epic_wiql_body(cls, area_path: str) -> bytes:
+        """
+        Build the JSON request body of the Epic WIQL query, once per area path.
+        
+        Args:
+            area_path: Azure DevOps area path holding the project Epics
+            
+        Returns:
+            Encoded {"query": ...} payload, posted as is
+        """
+        query = _EPIC_WIQL.format(area_path=cls._escape_wiql_value(area_path, max_length=256))
+        return json.dumps({"query": query}).encode()
+    
     async def _fetch_all_projects(self) -> List[EpicProject]:
-        """Fetch all Epic work items (projects) from Azure DevOps."""
+        """Fetch all Epic work items (projects) from Azure DevOps, cached for _PROJECT_CACHE_TTL."""
         project_id = self.azure_config.devops_project_id
+        area_path = self.azure_config.devops_area_path
         
-        # WIQL query to get all Epic work items
-        wiql_query = """
-        SELECT [System.Id], [System.Title], [System.State], [System.Description]
-        FROM workitems
-        WHERE [System.WorkItemType] = 'Epic'
-        AND [System.TeamProject] = 'HUB GenAI'
-        AND [System.AreaPath] = 'HUB GenAI\\Projeto DELTA'
-        ORDER BY [System.ChangedDate] DESC
-        """
+        cache_key = (project_id, area_path)
+        cached = _PROJECT_CACHE.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _PROJECT_CACHE_TTL:
+            if self.logger:
+                self.logger.info(f"Projects served from cache ({len(cached[1])} Epics)")
+            return cached[1]
         
-        url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
+        url = self.azure_config.get_devops_url(project_id) + _WIQL_PATH
         
         try:
-            response = self.make_request(
+            # Sync pooled session; run off the event loop so other work can proceed
+            response = await asyncio.to_thread(
+                self.make_request,
                 method="POST",
                 url=url,
                 headers=self.azure_config.get_devops_headers(),
-                json={"query": wiql_query}
+                data=self._epic_wiql_body(area_path)
             )
             
-            data = response.json()
+            data = self._decode_json(response)
             work_item_ids = [item["id"] for item in data.get("workItems", [])]
             
             if not work_item_ids:
@@ -186,9 +353,15 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
                         self.logger.warning(f"Failed to parse project {item.get('id')}: {e}")
                     continue
             
+            # Build the normalized name index once per fetch (reused for the cache
+            # TTL); when prefetched this overlaps the LLM extraction
+            _name_index(projects)
+            
+            _PROJECT_CACHE[cache_key] = (time.monotonic(), projects)
             return projects
             
         except Exception as e:
+            _PROJECT_CACHE.pop(cache_key, None)
             if self.logger:
                 self.logger.error(f"Failed to fetch projects: {e}", exc_info=True)
             raise
@@ -198,72 +371,130 @@ class ProjectSelectionService(BaseService[ProjectSelectionQuery, ProjectSelectio
         project_id: str,
         work_item_ids: List[int]
     ) -> List[Dict]:
-        """Get detailed information for work items."""
-        ids_str = ",".join(str(id) for id in work_item_ids[:200])
-        url = self.azure_config.get_devops_url(project_id) + f"/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
+        """
+        Get detailed information for work items.
+        The API accepts at most WORK_ITEMS_BATCH_SIZE ids per call, so ids are
+        split into batches that are requested concurrently.
+        """
+        base_url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/workitems"
+        headers = self.azure_config.get_devops_headers()
+        batch_size = self.WORK_ITEMS_BATCH_SIZE
         
-        response = self.make_request(
-            method="GET",
-            url=url,
-            headers=self.azure_config.get_devops_headers()
-        )
+        responses = await asyncio.gather(*(
+            asyncio.to_thread(
+                self.make_request,
+                method="GET",
+                url=f"{base_url}?ids={','.join(map(str, work_item_ids[i:i + batch_size]))}&api-version=7.1",
+                headers=headers
+            )
+            for i in range(0, len(work_item_ids), batch_size)
+        ))
         
-        return response.json().get("value", [])
+        return [item for response in responses for item in self._decode_json(response).get("value", [])]
     
     def _find_project_by_name(self, projects: List[EpicProject], project_name: str) -> List[EpicProject]:
         """
         Find projects matching the given name.
         Priority: exact match > starts with > contains
         """
-        name_lower = project_name.lower()
-        matches = []
-        
-        for project in projects:
-            proj_name_lower = project.name.lower() if project.name else ""
-            
-            if name_lower in proj_name_lower:
-                matches.append(project)
-        
+        name_norm = normalize_search_text(project_name)
+        # name_norm is cached per project, so this is a plain substring test per Epic;
+        # take one extra hit to know whether the scan was cut short
+        matches = list(islice(
+            (project for project in projects if name_norm in project.name_norm),
+            self.MAX_NAME_MATCHES + 1
+        ))
+        if len(matches) > self.MAX_NAME_MATCHES:
+            if self.logger:
+                self.logger.warning(
+                    "More than %s projects match '%s', keeping the first %s",
+                    self.MAX_NAME_MATCHES, project_name, self.MAX_NAME_MATCHES
+                )
+            del matches[self.MAX_NAME_MATCHES:]
         return matches
     
     def _rank_by_similarity(
         self,
         projects: List[EpicProject],
-        search_term: str
+        search_term: str,
+        max_results: int = 10
     ) -> List[EpicProject]:
         """
         Rank projects by relevance to search term (name matching only).
+        Projects that do not match at all are dropped; see _score_candidates.
+        
+        Args:
+            projects: Candidate projects
+            search_term: Project name given by the user
+            max_results: Maximum number of projects returned
+            
+        Returns:
+            Best matching projects, highest score first
+        """
+        return self._top_k(self._score_candidates(projects, search_term), max_results)
+    
+    @staticmethod
+    def _top_k(scored: List[Tuple[EpicProject, int]], k: int) -> List[EpicProject]:
+        """Select the k best scored projects (O(N log k); ties keep input order)."""
+        return [p for p, _ in heapq.nlargest(k, scored, key=itemgetter(1))]
+    
+    def _score_candidates(
+        self,
+        projects: List[EpicProject],
+        search_term: str
+    ) -> List[Tuple[EpicProject, int]]:
+        """
+        Score projects against the search term in a single pass (name matching only),
+        dropping non-matches. Results keep input order; use _top_k to rank them.
         
         Scoring:
         - 100: Exact match (case-insensitive)
         - 80: Name starts with search term
         - 60: Search term in name
         - 40: Name starts with any word from search term
+        
+        Args:
+            projects: Candidate projects
+            search_term: Project name given by the user
+            
+        Returns:
+            (project, score) pairs with score > 0
         """
-        term_lower = search_term.lower()
-        search_words = term_lower.split()
+        term_norm = normalize_search_text(search_term)
+        if "\0" in term_norm:
+            return []
+        search_words = tuple(word for word in term_norm.split() if len(word) > 2)
+        
+        scores = _name_index(projects).score(term_norm, search_words)
+        return [(projects[i], scores[i]) for i in sorted(scores)]
+    
+    def _fuzzy_candidates(self, projects: List[EpicProject], search_term: str) -> List[EpicProject]:
+        """
+        Typo-tolerant suggestions for names that matched nothing.
+        Compares the term with each full name and each of its words using
+        difflib similarity, skipping candidates the cheap upper bounds rule out.
+        
+        Args:
+            projects: Candidate projects
+            search_term: Project name given by the user
+            
+        Returns:
+            Up to MAX_FUZZY_SUGGESTIONS projects, most similar first
+        """
+        cutoff = self.FUZZY_CUTOFF
+        matcher = SequenceMatcher(autojunk=False)
+        # difflib caches information about the second sequence, so the term goes there
+        matcher.set_seq2(normalize_search_text(search_term))
         
         scored = []
         for project in projects:
-            name_lower = project.name.lower() if project.name else ""
-            score = 0
-            
-            # Exact match
-            if name_lower == term_lower:
-                score = 100
-            # Name starts with search term
-            elif name_lower.startswith(term_lower):
-                score = 80
-            # Search term anywhere in name
-            elif term_lower in name_lower:
-                score = 60
-            # Name starts with any word from search term
-            elif any(name_lower.startswith(word) for word in search_words if len(word) > 2):
-                score = 40
-            
-            scored.append((project, score))
+            best = 0.0
+            for candidate in (project.name_norm, *project.name_norm.split()):
+                matcher.set_seq1(candidate)
+                if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                    continue
+                best = max(best, matcher.ratio())
+            if best >= cutoff:
+                scored.append((project, best))
         
-        # Sort by score descending
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return [p for p, _ in scored]
-
+        return self._top_k(scored, self.MAX_FUZZY_SUGGESTIONS)
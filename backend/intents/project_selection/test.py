@@ -2,10 +2,11 @@
 Tests for project selection intent.
 """
 
+import json
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from backend.intents.project_selection.models import ProjectSelectionQuery, ProjectSelectionResponse
-from backend.intents.project_selection.service import ProjectSelectionService
+from backend.intents.project_selection.service import ProjectSelectionService, _PROJECT_CACHE
 from backend.intents.project_selection.extractor import ProjectSelectionExtractor
 from backend.models.project_models import EpicProject
 
@@ -66,6 +67,44 @@ class TestProjectSelectionExtractor:
         assert params.user_query == "Select Delta project"
         assert params.project_id is None
     
+    @pytest.mark.asyncio
+    async def test_extract_fast_path_skips_llm(self, extractor):
+        """Test simple selection phrasings are extracted without calling the LLM."""
+        with patch.object(extractor.azure_config, "create_chat_completion") as llm:
+            english = await extractor.extract_params("Choose project number 3")
+            portuguese = await extractor.extract_params("selecionar o projeto Gen AI")
+        
+        llm.assert_not_called()
+        assert english.project_name == "3"
+        assert portuguese.project_name == "Gen AI"
+        assert portuguese.user_query == "selecionar o projeto Gen AI"
+    
+    def test_extract_fast_path_defers_contextual_references(self, extractor):
+        """Test references to earlier results are left to the LLM."""
+        assert extractor._match_fast_path("escolha o segundo") is None
+        assert extractor._match_fast_path("I want to work on Gen AI") is None
+        for query in ("escolha a segunda", "select the second one", "use the last one", "abra o 2º"):
+            assert extractor._match_fast_path(query) is None, query
+    
+    def test_extract_fast_path_strips_articles(self, extractor):
+        """Test a leading article is not kept as part of the project name."""
+        assert extractor._match_fast_path("select the Delta project").project_name == "Delta"
+        assert extractor._match_fast_path("selecionar o Delta").project_name == "Delta"
+    
+    @pytest.mark.asyncio
+    async def test_extract_cache_shared_by_paraphrases(self, extractor):
+        """Test paraphrases around the same project name reuse one LLM extraction."""
+        ProjectSelectionExtractor._cache.clear()
+        extracted = ProjectSelectionQuery(user_query="I'd like to switch to Delta", project_name="Delta")
+        
+        with patch.object(extractor.azure_config, "create_chat_completion", return_value=extracted) as llm:
+            await extractor.extract_params("I'd like to switch to Delta")
+            params = await extractor.extract_params("Let's use the Delta project please")
+        
+        llm.assert_called_once()
+        assert params.project_name == "Delta"
+        assert params.user_query == "Let's use the Delta project please"
+    
     @pytest.mark.asyncio
     async def test_extract_empty_query(self, extractor):
         """Test extracting from empty query."""
@@ -99,7 +138,14 @@ class TestProjectSelectionService:
         matches = service._find_project_by_name(mock_projects, "XYZ")
         
         assert len(matches) == 0
-    
+
+    def test_find_project_by_name_caps_matches(self, service):
+        """Test the name scan stops after MAX_NAME_MATCHES hits."""
+        projects = [EpicProject(id=str(i), name=f"Delta {i}") for i in range(40)]
+        matches = service._find_project_by_name(projects, "delta")
+
+        assert [p.id for p in matches] == [str(i) for i in range(service.MAX_NAME_MATCHES)]
+
     def test_rank_by_similarity(self, service, mock_projects):
         """Test ranking by similarity (name only)."""
         matches = [p for p in mock_projects if "AI" in p.name]
@@ -127,6 +173,18 @@ class TestProjectSelectionService:
                 assert response.selected_project.name == "Delta Platform"
                 assert "selected successfully" in response.message
     
+    @pytest.mark.asyncio
+    async def test_select_exact_name_among_partial_matches(self, service, mock_projects):
+        """Test an exact name is selected even when other names contain it."""
+        projects = mock_projects + [EpicProject(id="9", name="Delta", state="Active")]
+        with patch.object(service, '_fetch_all_projects', return_value=projects), \
+                patch.object(service, '_update_project_context') as update:
+            response = await service.query_data(ProjectSelectionQuery(project_name="delta"))
+        
+        assert response.selected is True
+        assert response.selected_project.id == "9"
+        assert [p.id for p in update.call_args.args[1]] == ["1"]
+    
     @pytest.mark.asyncio
     async def test_select_multiple_matches(self, service, mock_projects):
         """Test returning ambiguous list for multiple matches."""
@@ -144,6 +202,13 @@ class TestProjectSelectionService:
             assert "Found" in response.message
             assert "specify which one" in response.message
     
+    def test_score_candidates_single_pass(self, service, mock_projects):
+        """Test matches are scored and non-matches dropped in one pass, then ranked top-k."""
+        scored = service._score_candidates(mock_projects, "ai")
+        
+        assert [(p.name, score) for p, score in scored] == [("Gen AI", 60), ("AI Research", 80)]
+        assert [p.name for p in service._rank_by_similarity(mock_projects, "ai", max_results=1)] == ["AI Research"]
+    
     @pytest.mark.asyncio
     async def test_no_matches_found(self, service, mock_projects):
         """Test no matches scenario."""
@@ -159,6 +224,44 @@ class TestProjectSelectionService:
             assert "not found" in response.message
 
 
+    @pytest.mark.asyncio
+    async def test_fetch_all_projects_cached(self, service):
+        """Test the Epic list is fetched once and then served from the cache."""
+        _PROJECT_CACHE.clear()
+        wiql = {"workItems": [{"id": 7}]}
+        details = {"value": [{"id": 7, "fields": {"System.Title": "Gen AI", "System.State": "Active"}}]}
+        
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.content = json.dumps(wiql if "/wiql" in url else details).encode()
+            return response
+        
+        with patch.object(service._session, "request", side_effect=fake_request) as request:
+            service.start_prefetch()
+            response = await service.query_data(ProjectSelectionQuery(project_name="Gen"))
+            await service._fetch_all_projects()
+        
+        assert response.selected_project.name == "Gen AI"
+        assert request.call_count == 2
+        assert "HUB GenAI\\Projeto DELTA" in json.loads(request.call_args_list[0].kwargs["data"])["query"]
+
+
+    @pytest.mark.asyncio
+    async def test_get_work_item_details_batches_ids(self, service):
+        """Test more than 200 ids are fetched in batches instead of truncated."""
+        def fake_request(method, url, **kwargs):
+            ids = url.split("ids=")[1].split("&")[0].split(",")
+            response = Mock(status_code=200)
+            response.content = json.dumps({"value": [{"id": int(i)} for i in ids]}).encode()
+            return response
+        
+        with patch.object(service._session, "request", side_effect=fake_request) as request:
+            items = await service._get_work_item_details("p", list(range(201)))
+        
+        assert request.call_count == 2
+        assert [item["id"] for item in items] == list(range(201))
+
+
 class TestProjectSelectionFallback:
     """Tests for fallback to search functionality."""
     
@@ -185,6 +288,17 @@ class TestProjectSelectionFallback:
                 assert len(response.suggested_projects) == 2
                 assert "Did you mean" in response.message
     
+    @pytest.mark.asyncio
+    async def test_fuzzy_suggestions_when_search_finds_nothing(self, service, mock_projects):
+        """Test a misspelled name gets close-spelling suggestions."""
+        with patch.object(service, '_fetch_all_projects', return_value=mock_projects), \
+                patch.object(service, '_fallback_to_search', return_value=None):
+            response = await service.query_data(ProjectSelectionQuery(project_name="Dleta"))
+        
+        assert response.selected is False
+        assert [p.name for p in response.suggested_projects] == ["Delta Platform"]
+        assert "Did you mean" in response.message
+    
     @pytest.mark.asyncio
     async def test_fallback_returns_suggestions(self, service, mock_projects):
         """Test fallback returns search results as suggestions."""
@@ -2,16 +2,48 @@
 Service for querying project team members from Azure DevOps.
 """
 
-from typing import List, Dict, Any
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 
 from backend.intents.base_intent import BaseService
 from backend.intents.project_search.models import ProjectSearchQuery
 from .models import ProjectTeamQuery, ProjectTeamResponse, TeamMember
 
+if TYPE_CHECKING:
+    from backend.intents.get_tasks.service import GetTasksService
+
+
+# Team members derived from the Epic tasks: (session_id, epic_id) -> (stored_at, members)
+_TEAM_CACHE: Dict[Tuple[Optional[str], Any], Tuple[float, List[TeamMember]]] = {}
+_TEAM_CACHE_TTL = 60  # seconds
+_TEAM_CACHE_MAXSIZE = 256
+
+
+def _team_cache_get(key: Tuple[Optional[str], Any]) -> Optional[List[TeamMember]]:
+    """Return cached team members if present and not expired."""
+    entry = _TEAM_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, members = entry
+    if time.monotonic() - stored_at > _TEAM_CACHE_TTL:
+        _TEAM_CACHE.pop(key, None)
+        return None
+    return members
+
+
+def _team_cache_put(key: Tuple[Optional[str], Any], members: List[TeamMember]) -> None:
+    """Store team members, evicting the oldest entry when full."""
+    _TEAM_CACHE.pop(key, None)
+    if len(_TEAM_CACHE) >= _TEAM_CACHE_MAXSIZE:
+        _TEAM_CACHE.pop(next(iter(_TEAM_CACHE)))
+    _TEAM_CACHE[key] = (time.monotonic(), members)
+
 
 class ProjectTeamService(BaseService[ProjectTeamQuery, ProjectTeamResponse]):
     """Service to query project team members from Azure DevOps API."""
     
+    # Created on the first team query and reused for this service instance
+    _tasks_service: Optional["GetTasksService"] = None
 
     async def query_data(self, params: ProjectTeamQuery) -> ProjectTeamResponse:
         """
@@ -35,52 +67,30 @@ class ProjectTeamService(BaseService[ProjectTeamQuery, ProjectTeamResponse]):
         
         epic_id = project_context.get("epic_id")
         
-    
+        # Repeated team questions for the same Epic skip the task queries
+        cache_key = (self.session_id, epic_id)
+        members = _team_cache_get(cache_key)
+        if members is not None:
+            return self._build_response(members)
+        
         # Import at method level to avoid circular import
         from backend.intents.get_tasks.service import GetTasksService
-        from backend.intents.get_tasks.models import GetTasksQuery, GetTasksResponse
         
         try:
-            # Create search service instance
-            search_service = GetTasksService(
-                session_id=self.session_id,
-            )
-            
-            # Create search query - Epic context is automatically handled by GetTasksService
-            # from session memory, so we don't need to pass epic_id here
-            search_query = GetTasksQuery(
-                user_query=None,
-                person_name=None,
-                task_state=None,
-                task_type=None,
-                start_date=None,
-                end_date=None
-            )
-            
-            # Execute search - will use Epic context if available in session
-            search_response = await search_service.query_data(search_query)
+            if self._tasks_service is None:
+                self._tasks_service = GetTasksService(
+                    session_id=self.session_id,
+                )
+            tasks_service = self._tasks_service
             
-            # Extract unique team members from tasks
-            team_members_dict = {}
-            if search_response and search_response.tasks:
-                for task in search_response.tasks:
-                    if task.assigned_to and task.assigned_to.strip():
-                        # Use assigned_to as key to avoid duplicates
-                        assigned_name = task.assigned_to.strip()
-                        if assigned_name not in team_members_dict:
-                            team_members_dict[assigned_name] = TeamMember(
-                                id=None,  # Not available in task data
-                                name=assigned_name,
-                                email=None,  # Not available in task data
-                                role=None     # Not available in task data
-                            )
+            # Epic context is handled by GetTasksService from session memory; only
+            # the type and assignee of each work item are fetched, not full task details
+            assignees = await tasks_service.query_assignees()
             
-            members = list(team_members_dict.values())
-            return ProjectTeamResponse(
-                members=members,
-                total_count=len(members),
-                message="Os integrantes do projeto são: " + ", ".join([member.name for member in members])
-            )
+            # id, email and role are not available in task data
+            members = [TeamMember(name=name) for name in assignees]
+            _team_cache_put(cache_key, members)
+            return self._build_response(members)
             
         except Exception as e:
             if self.logger:
@@ -90,4 +100,12 @@ class ProjectTeamService(BaseService[ProjectTeamQuery, ProjectTeamResponse]):
                 total_count=0,
                 message="Não foi possível recuperar os integrantes do projeto."
             )
-
+    
+    @staticmethod
+    def _build_response(members: List[TeamMember]) -> ProjectTeamResponse:
+        """Build the team response listing the given members."""
+        return ProjectTeamResponse(
+            members=members,
+            total_count=len(members),
+            message="Os integrantes do projeto são: " + ", ".join(member.name for member in members)
+        )
@@ -0,0 +1,126 @@
+"""
+Tests for project_team intent.
+"""
+
+import json
+import time
+import pytest
+from unittest.mock import Mock, patch, AsyncMock
+from backend.agents.memory import get_memory
+from backend.intents.get_tasks.service import GetTasksService
+from backend.intents.project_team.models import ProjectTeamQuery, ProjectTeamResponse
+from backend.intents.project_team.service import ProjectTeamService, _TEAM_CACHE, _TEAM_CACHE_TTL
+
+
+@pytest.fixture
+def service():
+    """Create service instance for testing, with an Epic selected in session memory."""
+    _TEAM_CACHE.clear()
+    get_memory().update_project_context("test_session", epic_id=10)
+    yield ProjectTeamService(session_id="test_session", intent_name="project_team")
+    get_memory().clear("test_session")
+
+
+class TestProjectTeamService:
+    """Tests for ProjectTeamService."""
+
+    @staticmethod
+    def _mock_devops(wiql_json, workitems_json):
+        """Fake the HTTP session: answer WIQL and workitemsbatch POSTs with canned JSON."""
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.raise_for_status.return_value = None
+            response.content = json.dumps(wiql_json if "/wiql" in url else workitems_json).encode()
+            return response
+        return fake_request
+
+    @pytest.mark.asyncio
+    async def test_query_data_lists_task_assignees(self, service):
+        """Test members come from the Epic's task assignees, fetched with two requests."""
+        wiql = {"workItemRelations": [
+            {"source": None, "target": {"id": 10}},
+            {"source": {"id": 10}, "target": {"id": 1}},
+            {"source": {"id": 10}, "target": {"id": 2}},
+        ]}
+        details = {"value": [
+            {"id": 10, "fields": {"System.WorkItemType": "Epic", "System.AssignedTo": {"displayName": "Chefe"}}},
+            {"id": 1, "fields": {"System.WorkItemType": "Task", "System.AssignedTo": {"displayName": "Ana"}}},
+            {"id": 2, "fields": {"System.WorkItemType": "Task", "System.AssignedTo": {"displayName": "Bia"}}},
+        ]}
+        fake = self._mock_devops(wiql, details)
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            response = await service.query_data(ProjectTeamQuery())
+
+        assert isinstance(response, ProjectTeamResponse)
+        assert [member.name for member in response.members] == ["Ana", "Bia"]
+        assert response.total_count == 2
+        assert response.message == "Os integrantes do projeto são: Ana, Bia"
+        assert request.call_count == 2
+        assert "[Source].[System.Id] = 10" in request.call_args_list[0].kwargs["json"]["query"]
+
+    @pytest.mark.asyncio
+    async def test_query_data_cached_per_session_and_epic(self, service):
+        """Test a repeated question for the same Epic is answered from the team cache."""
+        with patch.object(GetTasksService, "query_assignees", new=AsyncMock(return_value=["Ana"])) as assignees:
+            first = await service.query_data(ProjectTeamQuery())
+            second = await service.query_data(ProjectTeamQuery())
+
+        assignees.assert_awaited_once()
+        assert [member.name for member in second.members] == ["Ana"]
+        assert second.message == first.message
+
+    @pytest.mark.asyncio
+    async def test_query_data_cache_expires(self, service):
+        """Test the team is fetched again once the cache entry is older than the TTL."""
+        expired = time.monotonic() + _TEAM_CACHE_TTL + 1
+        with patch.object(GetTasksService, "query_assignees", new=AsyncMock(return_value=["Ana"])) as assignees:
+            await service.query_data(ProjectTeamQuery())
+            with patch("backend.intents.project_team.service.time.monotonic", return_value=expired):
+                await service.query_data(ProjectTeamQuery())
+
+        assert assignees.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_query_data_cache_isolated_between_sessions(self, service):
+        """Test another session asking about the same Epic does not get this session's entry."""
+        get_memory().update_project_context("other_session", epic_id=10)
+        other = ProjectTeamService(session_id="other_session", intent_name="project_team")
+
+        with patch.object(GetTasksService, "query_assignees", new=AsyncMock(side_effect=[["Ana"], ["Bia"]])) as assignees:
+            mine = await service.query_data(ProjectTeamQuery())
+            theirs = await other.query_data(ProjectTeamQuery())
+        get_memory().clear("other_session")
+
+        assert assignees.await_count == 2
+        assert [member.name for member in mine.members] == ["Ana"]
+        assert [member.name for member in theirs.members] == ["Bia"]
+
+    @pytest.mark.asyncio
+    async def test_tasks_service_created_once(self, service):
+        """Test the GetTasksService is created lazily and reused across queries."""
+        assert service._tasks_service is None
+
+        with patch.object(GetTasksService, "query_assignees", new=AsyncMock(return_value=["Ana"])):
+            await service.query_data(ProjectTeamQuery())
+            tasks_service = service._tasks_service
+            _TEAM_CACHE.clear()
+            await service.query_data(ProjectTeamQuery())
+
+        assert isinstance(tasks_service, GetTasksService)
+        assert tasks_service.session_id == "test_session"
+        assert service._tasks_service is tasks_service
+
+    @pytest.mark.asyncio
+    async def test_query_data_failure_returns_empty_team(self, service):
+        """Test DevOps errors produce an empty team with an explanatory message, not cached."""
+        with patch.object(GetTasksService, "query_assignees", new=AsyncMock(side_effect=Exception("boom"))):
+            response = await service.query_data(ProjectTeamQuery())
+
+        assert response.members == []
+        assert response.total_count == 0
+        assert response.message == "Não foi possível recuperar os integrantes do projeto."
+        assert not _TEAM_CACHE
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
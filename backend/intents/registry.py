@@ -3,7 +3,8 @@ Dynamic intent registry system.
 Intents auto-register themselves with metadata.
 """
 
-from typing import Dict, List, Type, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Type, Any, Optional
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
 
@@ -30,14 +31,22 @@ class IntentRegistry:
     """
     
     _intents: Dict[str, IntentMetadata] = {}
+    # Read-only live view of _intents, handed out instead of copies
+    _intents_view: Mapping[str, IntentMetadata] = MappingProxyType(_intents)
+    # Formatted get_descriptions() text, rebuilt only after a registration
+    _descriptions_cache: Optional[str] = None
     
     @classmethod
     def register(cls, metadata: IntentMetadata):
         """
         Register an intent with its metadata.
-        Allows re-registration (useful for testing) but warns if already exists.
+        Registering the same metadata again is a no-op; replacing it with
+        different metadata is allowed (useful for testing) but warns.
         """
-        if metadata.category in cls._intents:
+        existing = cls._intents.get(metadata.category)
+        if existing is not None:
+            if existing == metadata:
+                return
             # Allow re-registration for testing purposes
             # In production this shouldn't happen due to import caching
             import warnings
@@ -46,12 +55,18 @@ class IntentRegistry:
                 UserWarning
             )
         cls._intents[metadata.category] = metadata
+        cls._descriptions_cache = None
     
     @classmethod
     def get_all(cls) -> Dict[str, IntentMetadata]:
-        """Get all registered intents."""
+        """Get all registered intents (a copy the caller may modify)."""
         return cls._intents.copy()
     
+    @classmethod
+    def get_all_view(cls) -> Mapping[str, IntentMetadata]:
+        """Get a read-only view of all registered intents, without copying."""
+        return cls._intents_view
+    
     @classmethod
     def get(cls, category: str) -> IntentMetadata:
         """Get metadata for a specific intent."""
@@ -66,11 +81,13 @@ class IntentRegistry:
     
     @classmethod
     def get_descriptions(cls) -> str:
-        """Get formatted descriptions for all intents (for LLM prompt)."""
-        lines = []
-        for category, metadata in cls._intents.items():
-            lines.append(f"- {category}: {metadata.name} - {metadata.description}")
-        return "\n".join(lines)
+        """Get formatted descriptions for all intents (for LLM prompt), cached between registrations."""
+        if cls._descriptions_cache is None:
+            cls._descriptions_cache = "\n".join(
+                f"- {category}: {metadata.name} - {metadata.description}"
+                for category, metadata in cls._intents.items()
+            )
+        return cls._descriptions_cache
     
     @classmethod
     def get_handler(cls, category: str, session_id: Optional[str] = None):
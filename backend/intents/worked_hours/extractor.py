@@ -3,7 +3,9 @@ Parameter extractor for worked hours intent.
 Uses LLM to extract structured parameters from natural language.
 """
 
-from typing import Optional, Dict, cast
+import inspect
+import time
+from typing import Any, ClassVar, Optional, Dict, Tuple, cast
 from datetime import datetime
 
 from backend.intents.base_intent import BaseExtractor
@@ -13,7 +15,9 @@ from .models import WorkedHoursQuery
 class WorkedHoursExtractor(BaseExtractor[WorkedHoursQuery]):
     """Extracts parameters for worked hours queries using LLM."""
     
-    EXTRACTION_PROMPT = """You are a parameter extraction assistant for Azure DevOps queries.
+    # cleandoc strips the source indentation once at import: it would otherwise be
+    # sent (and billed) as prompt tokens on every extraction
+    EXTRACTION_PROMPT = inspect.cleandoc("""You are a parameter extraction assistant for Azure DevOps queries.
         Extract the following information from the user's query:
         - person_name: Name of the person/team member (if mentioned)
         - start_date: Start date (convert relative dates like "this week", "last month" to ISO format)
@@ -32,7 +36,17 @@ class WorkedHoursExtractor(BaseExtractor[WorkedHoursQuery]):
         5. DO NOT extract project information - it comes from conversation context
 
         User query: {query}
-        """
+        """)
+    
+    SYSTEM_MESSAGE = "You are a parameter extraction assistant. Extract information accurately."
+
+    CACHE_TTL = 3600  # seconds
+    CACHE_MAXSIZE = 1024
+    
+    # Process-wide extraction cache: rendered prompt -> (expires_at, params dump).
+    # The prompt embeds the current date and context, so a new day or a different
+    # context never hits entries extracted for another one
+    _cache: ClassVar[Dict[str, Tuple[float, Dict[str, Any]]]] = {}
 
     async def extract_params(
         self,
@@ -57,17 +71,23 @@ class WorkedHoursExtractor(BaseExtractor[WorkedHoursQuery]):
         if context and context.get("last_params"):
             context_str = f"Previous query parameters: {context['last_params']}"
             if self.logger:
-                self.logger.info(f"Using conversation context: {context.get('last_query', 'N/A')}"[:150])
+                self.logger.info("Using conversation context: %.122s", context.get('last_query', 'N/A'))
         
         # Current date for relative date calculation
         current_date = datetime.now().strftime("%Y-%m-%d")
         
-        prompt = self.EXTRACTION_PROMPT.format(
+        prompt = self._render_prompt(
             current_date=current_date,
             context=context_str,
             query=query
         )
         
+        cached = self._cache.get(prompt)
+        if cached is not None and cached[0] > time.time():
+            if self.logger:
+                self.logger.info("Parameters served from extraction cache")
+            return WorkedHoursQuery(**cached[1])
+        
         if self.logger:
             self.logger.info("Calling LLM for parameter extraction...")
         
@@ -79,7 +99,7 @@ class WorkedHoursExtractor(BaseExtractor[WorkedHoursQuery]):
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a parameter extraction assistant. Extract information accurately."
+                        "content": self.SYSTEM_MESSAGE
                     },
                     {
                         "role": "user",
@@ -93,6 +113,10 @@ class WorkedHoursExtractor(BaseExtractor[WorkedHoursQuery]):
         )
         
         if self.logger:
-            self.logger.info(f"Parameters extracted successfully: {params.model_dump()}")
+            self.logger.info("Parameters extracted successfully: %s", params)
+        
+        if len(self._cache) >= self.CACHE_MAXSIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[prompt] = (time.time() + self.CACHE_TTL, params.model_dump())
         
         return params
@@ -2,15 +2,43 @@
 Service for querying worked hours from Azure DevOps.
 """
 
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Tuple
 
 from backend.intents.base_intent import BaseService
 from .models import WorkedHoursQuery, WorkedHoursResponse, HourBreakdown
 
 
+# Fixed parts of the worked hours WIQL query; only the WHERE conditions vary.
+# Columns match WorkedHoursService.DETAIL_FIELDS (filters need not be selected).
+# The suffix takes the configured area path (azure_config.devops_area_path)
+_WIQL_PREFIX = """
+        SELECT
+            [System.Id],
+            [System.Title],
+            [System.State],
+            [Microsoft.VSTS.Scheduling.CompletedWork],
+            [System.ChangedDate]
+        FROM workitems
+        WHERE """
+_WIQL_SUFFIX = """
+        AND [System.AreaPath] = '{area_path}'
+        ORDER BY [System.ChangedDate] DESC
+        """
+
+
 class WorkedHoursService(BaseService[WorkedHoursQuery, WorkedHoursResponse]):
     """Service to query worked hours from Azure DevOps API."""
     
+    WORK_ITEMS_BATCH_SIZE = 200  # Azure DevOps limit of ids per work items request
+    # Only fields read by _process_work_items are requested
+    DETAIL_FIELDS = (
+        "System.Title",
+        "System.State",
+        "System.ChangedDate",
+        "Microsoft.VSTS.Scheduling.CompletedWork",
+    )
+    
     async def query_data(self, params: WorkedHoursQuery) -> WorkedHoursResponse:
         """
         Query worked hours from Azure DevOps.
@@ -25,26 +53,8 @@ class WorkedHoursService(BaseService[WorkedHoursQuery, WorkedHoursResponse]):
         if isinstance(params, dict):
             params = WorkedHoursQuery(**params)
         
-        # Build WIQL query
-        wiql_query = self._build_wiql_query(params)
-        
-        # Get project ID (use default if not provided)
-        project_id = params.project_id or self.azure_config.devops_project_id
-        
-        # Execute query
-        url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
-        
         try:
-            # Use base service method with timeout and retry
-            response = self.make_request(
-                method="POST",
-                url=url,
-                headers=self.azure_config.get_devops_headers(),
-                json={"query": wiql_query}
-            )
-            
-            data = response.json()
-            work_item_ids = [item["id"] for item in data.get("workItems", [])]
+            project_id, work_item_ids = await self._query_work_item_ids(params)
             
             if not work_item_ids:
                 return WorkedHoursResponse(
@@ -65,60 +75,91 @@ class WorkedHoursService(BaseService[WorkedHoursQuery, WorkedHoursResponse]):
             # Error already handled by base service with detailed message
             raise
     
-    def _build_wiql_query(self, params: WorkedHoursQuery) -> str:
-        """Build WIQL query based on parameters."""
-        conditions = []
+    async def _query_work_item_ids(self, params: WorkedHoursQuery) -> Tuple[str, List[int]]:
+        """
+        Run the worked hours WIQL query.
         
+        Returns:
+            Tuple of (project id used, matching work item ids)
+        """
+        # Build WIQL query
+        wiql_query = self._build_wiql_query(params)
+        
+        # Get project ID (use default if not provided)
+        project_id = params.project_id or self.azure_config.devops_project_id
+        
+        # Execute query
+        url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/wiql?api-version=7.1"
+        
+        # Sync pooled session with timeout and retry; run off the event loop
+        response = await asyncio.to_thread(
+            self.make_request,
+            method="POST",
+            url=url,
+            headers=self.azure_config.get_devops_headers(),
+            json={"query": wiql_query}
+        )
+        
+        data = self._decode_json(response)
+        return project_id, [item["id"] for item in data.get("workItems", [])]
+    
+    def _build_wiql_query(self, params: WorkedHoursQuery) -> str:
+        """Build WIQL query based on parameters (user values are escaped)."""
         # Always filter by project
-        conditions.append("[System.TeamProject] = 'Generative AI'")
+        conditions = ["[System.TeamProject] = 'Generative AI'"]
         
         # Filter by assigned person if specified
-        if params.person_name:
-            conditions.append(f"[System.AssignedTo] CONTAINS '{params.person_name}'")
+        person_name = self._escape_wiql_value(params.person_name)
+        if person_name:
+            conditions.append(f"[System.AssignedTo] CONTAINS '{person_name}'")
         
         # Filter by date range if specified
-        if params.start_date:
-            conditions.append(f"[System.ChangedDate] >= '{params.start_date}'")
-        
-        if params.end_date:
-            conditions.append(f"[System.ChangedDate] <= '{params.end_date}'")
+        start_date = self._escape_wiql_value(params.start_date)
+        if start_date:
+            conditions.append(f"[System.ChangedDate] >= '{start_date}'")
         
-        where_clause = " AND ".join(conditions)
-        
-        query = f"""
-        SELECT
-            [System.Id],
-            [System.Title],
-            [System.State],
-            [System.AssignedTo],
-            [Microsoft.VSTS.Scheduling.CompletedWork],
-            [System.ChangedDate]
-        FROM workitems
-        WHERE {where_clause}
-        AND [System.AreaPath] = 'HUB GenAI\\Projeto DELTA'
-        ORDER BY [System.ChangedDate] DESC
-        """
+        end_date = self._escape_wiql_value(params.end_date)
+        if end_date:
+            conditions.append(f"[System.ChangedDate] <= '{end_date}'")
         
-        return query
+        area_path = self._escape_wiql_value(self.azure_config.devops_area_path, max_length=256)
+        return _WIQL_PREFIX + " AND ".join(conditions) + _WIQL_SUFFIX.format(area_path=area_path)
     
     async def _get_work_item_details(
         self,
         project_id: str,
         work_item_ids: List[int]
     ) -> List[Dict[str, Any]]:
-        """Get detailed information for work items."""
-        # Batch request for work items
-        ids_str = ",".join(str(id) for id in work_item_ids[:200])  # Limit to 200
-        url = self.azure_config.get_devops_url(project_id) + f"/_apis/wit/workitems?ids={ids_str}&api-version=7.1"
-        
-        # Use base service method with timeout and retry
-        response = self.make_request(
-            method="GET",
+        """
+        Get detailed information for work items.
+        The API accepts at most WORK_ITEMS_BATCH_SIZE ids per call, so ids are
+        split into batches that are requested concurrently.
+        """
+        batch_size = self.WORK_ITEMS_BATCH_SIZE
+        batches = await asyncio.gather(*(
+            self._fetch_details_batch(project_id, work_item_ids[i:i + batch_size])
+            for i in range(0, len(work_item_ids), batch_size)
+        ))
+        return [item for batch in batches for item in batch]
+    
+    async def _fetch_details_batch(
+        self,
+        project_id: str,
+        work_item_ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one batch of work items (at most WORK_ITEMS_BATCH_SIZE ids).
+        Uses the workitemsbatch endpoint so only DETAIL_FIELDS are returned.
+        """
+        url = self.azure_config.get_devops_url(project_id) + "/_apis/wit/workitemsbatch?api-version=7.1"
+        response = await asyncio.to_thread(
+            self.make_request,
+            method="POST",
             url=url,
-            headers=self.azure_config.get_devops_headers()
+            headers=self.azure_config.get_devops_headers(),
+            json={"ids": work_item_ids, "fields": list(self.DETAIL_FIELDS)}
         )
-        
-        return response.json().get("value", [])
+        return self._decode_json(response).get("value", [])
     
     def _process_work_items(
         self,
@@ -126,24 +167,9 @@ class WorkedHoursService(BaseService[WorkedHoursQuery, WorkedHoursResponse]):
         params: WorkedHoursQuery
     ) -> WorkedHoursResponse:
         """Process work items to calculate hours and create breakdown."""
-        total_hours = 0.0
-        breakdown = []
-        
-        for item in work_items:
-            fields = item.get("fields", {})
-            
-            # Get completed work hours
-            hours = fields.get("Microsoft.VSTS.Scheduling.CompletedWork", 0.0) or 0.0
-            total_hours += hours
-            
-            # Add to breakdown
-            if hours > 0:
-                breakdown.append(HourBreakdown(
-                    date=fields.get("System.ChangedDate", "")[:10],  # Get date only
-                    task_title=fields.get("System.Title", "Untitled"),
-                    hours=hours,
-                    state=fields.get("System.State")
-                ))
+        rows = self._hour_rows(work_items)
+        total_hours = sum((hours for hours, _ in rows), 0.0)
+        breakdown = self._build_breakdown(rows)
         
         return WorkedHoursResponse(
             person=params.person_name,
@@ -152,3 +178,25 @@ class WorkedHoursService(BaseService[WorkedHoursQuery, WorkedHoursResponse]):
             end_date=params.end_date or "",
             breakdown=breakdown
         )
+    
+    @staticmethod
+    def _hour_rows(work_items: List[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any]]]:
+        """Pair each work item's fields with its completed work, read once (0 if unset)."""
+        return [
+            (fields.get("Microsoft.VSTS.Scheduling.CompletedWork", 0.0) or 0.0, fields)
+            for fields in (item.get("fields", {}) for item in work_items)
+        ]
+    
+    @staticmethod
+    def _build_breakdown(rows: List[Tuple[float, Dict[str, Any]]]) -> List[HourBreakdown]:
+        """Build breakdown entries for the rows with logged hours."""
+        return [
+            HourBreakdown(
+                date=fields.get("System.ChangedDate", "")[:10],  # Get date only
+                task_title=fields.get("System.Title", "Untitled"),
+                hours=float(hours),
+                state=fields.get("System.State")
+            )
+            for hours, fields in rows
+            if hours > 0
+        ]
@@ -4,8 +4,16 @@ Auto-registrado en el sistema de tests.
 """
 
 import asyncio
+import json
+import time
 from typing import Dict, Any
 
+import pytest
+from unittest.mock import Mock, patch
+from backend.intents.worked_hours.models import WorkedHoursQuery
+from backend.intents.worked_hours.service import WorkedHoursService
+from backend.intents.worked_hours.extractor import WorkedHoursExtractor
+
 
 async def test_worked_hours_handler():
     """Test: Handler completo de worked_hours."""
@@ -174,6 +182,167 @@ async def run_tests() -> Dict[str, Any]:
 # This avoids circular import issues with backend.intents module
 
 
+# ==============================================================================
+# SERVICE / EXTRACTOR UNIT TESTS (mocked Azure DevOps session and LLM)
+# ==============================================================================
+
+
+@pytest.fixture
+def service():
+    """Create service instance for testing."""
+    return WorkedHoursService(session_id="test_session", intent_name="worked_hours")
+
+
+@pytest.fixture
+def extractor():
+    """Create extractor instance for testing."""
+    return WorkedHoursExtractor(session_id="test_session", intent_name="worked_hours")
+
+
+def _fields(title, hours, date="2025-11-10T12:00:00Z", state="Closed"):
+    """Work item fields as returned by workitemsbatch."""
+    return {
+        "System.Title": title,
+        "System.State": state,
+        "System.ChangedDate": date,
+        "Microsoft.VSTS.Scheduling.CompletedWork": hours,
+    }
+
+
+class TestWorkedHoursService:
+    """Tests for WorkedHoursService."""
+    
+    @staticmethod
+    def _mock_devops(wiql_json, fields_by_id):
+        """Fake the HTTP session: answer the WIQL POST and workitemsbatch POSTs with canned JSON."""
+        def fake_request(method, url, **kwargs):
+            response = Mock(status_code=200)
+            response.raise_for_status.return_value = None
+            if "/wiql" in url:
+                body = wiql_json
+            else:
+                body = {"value": [{"id": i, "fields": fields_by_id.get(i, {})} for i in kwargs["json"]["ids"]]}
+            response.content = json.dumps(body).encode()
+            return response
+        return fake_request
+    
+    @pytest.mark.asyncio
+    async def test_query_data_totals_and_breakdown(self, service):
+        """Test totals add every item while the breakdown keeps only items with hours."""
+        wiql = {"workItems": [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]}
+        fields = {
+            1: _fields("Task A", 2),
+            2: _fields("Task B", 3.5, date="2025-11-11T08:30:00.123Z", state=None),
+            3: _fields("Task C", None),
+            4: _fields("Task D", 0),
+        }
+        fake = self._mock_devops(wiql, fields)
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            response = await service.query_data(WorkedHoursQuery(user_query="horas", person_name="Ana"))
+        
+        assert request.call_count == 2
+        assert response.total_hours == 5.5
+        assert [(b.date, b.task_title, b.hours, b.state) for b in response.breakdown] == [
+            ("2025-11-10", "Task A", 2.0, "Closed"),
+            ("2025-11-11", "Task B", 3.5, None),
+        ]
+        assert isinstance(response.breakdown[0].hours, float)
+    
+    @pytest.mark.asyncio
+    async def test_query_data_no_work_items(self, service):
+        """Test an empty WIQL result returns zero hours without fetching details."""
+        fake = self._mock_devops({"workItems": []}, {})
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            response = await service.query_data(WorkedHoursQuery(user_query="horas", start_date="2025-11-01"))
+        
+        assert request.call_count == 1
+        assert response.total_hours == 0.0
+        assert response.breakdown == []
+        assert response.start_date == "2025-11-01"
+    
+    @pytest.mark.asyncio
+    async def test_get_work_item_details_batches_ids(self, service):
+        """Test more than 200 ids are split into workitemsbatch requests for DETAIL_FIELDS only."""
+        fake = self._mock_devops({}, {})
+        with patch.object(service._session, "request", side_effect=fake) as request:
+            items = await service._get_work_item_details("p", list(range(450)))
+        
+        assert [item["id"] for item in items] == list(range(450))
+        calls = request.call_args_list
+        assert [len(call.kwargs["json"]["ids"]) for call in calls] == [200, 200, 50]
+        assert all(call.kwargs["json"]["fields"] == list(WorkedHoursService.DETAIL_FIELDS) for call in calls)
+        assert all(call.kwargs["method"] == "POST" for call in calls)
+        assert all("/_apis/wit/workitemsbatch" in call.kwargs["url"] for call in calls)
+    
+    def test_build_wiql_query_escapes_values(self, service):
+        """Test user values and the configured area path are quote-escaped in the WIQL."""
+        params = WorkedHoursQuery(
+            user_query="test",
+            person_name="O'Brien' OR 1=1",
+            start_date="2025-11-01",
+            end_date="2025-11-30' OR 'x",
+        )
+        with patch.object(service.azure_config, "devops_area_path", "Team\\O'Neil"):
+            query = service._build_wiql_query(params)
+        
+        assert "[System.AssignedTo] CONTAINS 'O''Brien'' OR 1=1'" in query
+        assert "[System.ChangedDate] >= '2025-11-01'" in query
+        assert "[System.ChangedDate] <= '2025-11-30'' OR ''x'" in query
+        assert "[System.AreaPath] = 'Team\\O''Neil'" in query
+    
+    def test_build_wiql_query_without_filters(self, service):
+        """Test only the fixed conditions are present when nothing was extracted."""
+        query = service._build_wiql_query(WorkedHoursQuery(user_query="test"))
+        
+        assert "[System.AssignedTo]" not in query
+        assert "[System.ChangedDate] >=" not in query
+        assert query.rstrip().endswith("ORDER BY [System.ChangedDate] DESC")
+
+
+class TestWorkedHoursExtractor:
+    """Tests for WorkedHoursExtractor (LLM mocked)."""
+    
+    @pytest.mark.asyncio
+    async def test_extract_cache_hit(self, extractor):
+        """Test a repeated query (same date and context) reuses the first extraction."""
+        WorkedHoursExtractor._cache.clear()
+        extracted = WorkedHoursQuery(user_query="horas da Ana", person_name="Ana")
+        
+        with patch.object(extractor.azure_config, "create_chat_completion", return_value=extracted) as llm:
+            first = await extractor.extract_params("horas da Ana")
+            second = await extractor.extract_params("horas da Ana")
+        
+        llm.assert_called_once()
+        assert second.person_name == "Ana"
+        assert second is not first
+    
+    @pytest.mark.asyncio
+    async def test_extract_cache_keyed_by_context(self, extractor):
+        """Test a different conversation context does not hit the cached extraction."""
+        WorkedHoursExtractor._cache.clear()
+        extracted = WorkedHoursQuery(user_query="e ontem?")
+        
+        with patch.object(extractor.azure_config, "create_chat_completion", return_value=extracted) as llm:
+            await extractor.extract_params("e ontem?")
+            await extractor.extract_params("e ontem?", context={"last_params": {"person_name": "Ana"}})
+        
+        assert llm.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_extract_cache_expiry(self, extractor):
+        """Test an expired cache entry calls the LLM again."""
+        WorkedHoursExtractor._cache.clear()
+        extracted = WorkedHoursQuery(user_query="horas da Ana", person_name="Ana")
+        expired = time.time() + WorkedHoursExtractor.CACHE_TTL + 1
+        
+        with patch.object(extractor.azure_config, "create_chat_completion", return_value=extracted) as llm:
+            await extractor.extract_params("horas da Ana")
+            with patch("backend.intents.worked_hours.extractor.time.time", return_value=expired):
+                await extractor.extract_params("horas da Ana")
+        
+        assert llm.call_count == 2
+
+
 if __name__ == "__main__":
     """Run tests standalone."""
     result = asyncio.run(run_tests())
@@ -1,13 +1,25 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from .api.v1.router import router
+from .intents.base_intent import BaseService
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled Azure DevOps connections
+    BaseService.close_shared_sessions()
+
+
 app = FastAPI(
     title="Delta API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS para permitir o front React
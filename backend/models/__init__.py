@@ -17,6 +17,7 @@ from .devops_models import (
 from .project_models import (
     Project,
     EpicProject,
+    normalize_search_text,
 )
 
 __all__ = [
@@ -29,4 +30,5 @@ __all__ = [
     # Project models
     "Project",
     "EpicProject",
+    "normalize_search_text",
 ]
@@ -1,7 +1,10 @@
 #devops_model
 #app/core/devops_models.py
+import asyncio
 import requests
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+from requests.adapters import HTTPAdapter
 
 
 import os
@@ -12,6 +15,11 @@ from datetime import datetime
 from backend.config.azure import get_azure_config
 config = get_azure_config()
 
+# Keep-alive connections for WorkItem.getInfo, which fetches a whole hierarchy level at once
+HIERARCHY_POOL_MAXSIZE = 32
+# Maximum ids per workitemsbatch request (Azure DevOps limit)
+WORK_ITEMS_BATCH_SIZE = 200
+
 #Team member
 class IdentityRef(BaseModel):
     _links: Optional[Any] = None
@@ -143,35 +151,90 @@ class WorkItem(BaseModel):
                 "Microsoft.VSTS.Scheduling.TargetDate"]
     
     def getInfo(self, levels:int, headers, azure_path="https://dev.azure.com/FSO-DnA-Devops", azure_project_id=config.devops_project_id):
-        #The only thing that needs is id to query all
-        print(f"va a obtener info de {self.id}")
-        base_url = f"{azure_path}/{azure_project_id}/_apis/wit/workItems/{self.id}?api-version=7.0"
-        if levels>0: base_url += f"&$expand=relations"
-
-        response = requests.get(base_url, headers=headers)
-        response.raise_for_status()  # Raise an error for bad responses
-
-        if response.status_code == 200:
-            data = response.json()
-            '''
-            #lo haremos fuera
-            fields = data.get("fields", {})
-            print("los items que mandare para parsear",fields)
-            if not self.title:
-                self.parseFields(fields)
-            '''
-            if data.get("relations"):
-                print("va a ir por las relaciones")
-                for relation in data["relations"]:
+        #Sync entry point: walks the hierarchy with getInfoAsync over one pooled session
+        with requests.Session() as session:
+            session.mount("https://", HTTPAdapter(pool_maxsize=HIERARCHY_POOL_MAXSIZE))
+
+            def traversal():
+                asyncio.run(self.getInfoAsync(levels, session, headers, azure_path, azure_project_id))
+
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                traversal()
+            else:
+                #Called from inside an event loop (e.g. FastAPI), where asyncio.run raises:
+                #run the traversal on its own loop in a worker thread, blocking like the old sync version
+                #(async callers should await getInfoAsync instead)
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    executor.submit(traversal).result()
+
+    async def getInfoAsync(self, levels:int, session: requests.Session, headers, azure_path="https://dev.azure.com/FSO-DnA-Devops", azure_project_id=config.devops_project_id):
+        """
+        Load this work item's descendants up to `levels` deep, breadth first.
+        Each level is fetched with workitemsbatch, so it costs one request per
+        WORK_ITEMS_BATCH_SIZE items instead of one request per item.
+
+        Args:
+            levels: How many hierarchy levels below this item to load
+            session: HTTP session shared by the whole traversal (keeps connections alive)
+            headers: Azure DevOps request headers
+            azure_path: Organization URL
+            azure_project_id: Project id or name
+        """
+        level = [self]
+        while level and levels > 0:
+            print(f"va a obtener info de {[node.id for node in level]}")
+            fetched = await WorkItem.fetch_batch([node.id for node in level], session, headers, azure_path, azure_project_id)
+            # Keyed by int: ids assigned after construction (e.g. EpicProject.root.id) may be str
+            relations_by_id = {int(item.id): item.relations or [] for item in fetched}
+
+            next_level = []
+            for node in level:
+                for relation in relations_by_id.get(int(node.id), []):
                     if relation.get("rel") == "System.LinkTypes.Hierarchy-Forward":
                         child_id = relation["url"].split("/")[-1]
-                        child_work_item = WorkItem.create_with_defaults(child_id, self.organization, self.project)
-                        child_work_item.getInfo(levels-1, headers, azure_path, azure_project_id)
-                        self.childs.append(child_work_item)
+                        child_work_item = WorkItem.create_with_defaults(child_id, node.organization, node.project)
+                        node.childs.append(child_work_item)
+                        next_level.append(child_work_item)
 
                     elif relation.get("rel") == "System.LinkTypes.Hierarchy-Reverse":
                         parent_id = relation["url"].split("/")[-1]
-                        self.parentId = parent_id
+                        node.parentId = parent_id
+
+            level = next_level
+            levels -= 1
+
+    @classmethod
+    async def fetch_batch(cls, ids: List[int], session: requests.Session, headers, azure_path="https://dev.azure.com/FSO-DnA-Devops", azure_project_id=config.devops_project_id) -> List["WorkItem"]:
+        """
+        Fetch work items with their relations through the workitemsbatch endpoint.
+        Ids are sent in chunks of WORK_ITEMS_BATCH_SIZE (the API limit), concurrently.
+
+        Args:
+            ids: Work item ids to fetch
+            session: HTTP session used for the requests
+            headers: Azure DevOps request headers
+            azure_path: Organization URL
+            azure_project_id: Project id or name
+
+        Returns:
+            Fetched work items, in the order of ids
+        """
+        url = f"{azure_path}/{azure_project_id}/_apis/wit/workitemsbatch?api-version=7.0"
+        ids = list(dict.fromkeys(int(id) for id in ids))
+
+        def fetch(chunk):
+            # fields can't be combined with $expand, so the default fields come back
+            response = session.post(url, headers=headers, json={"ids": chunk, "$expand": "Relations"})
+            response.raise_for_status()  # Raise an error for bad responses
+            return response.json().get("value", [])
+
+        chunks = await asyncio.gather(*(
+            asyncio.to_thread(fetch, ids[i:i + WORK_ITEMS_BATCH_SIZE])
+            for i in range(0, len(ids), WORK_ITEMS_BATCH_SIZE)
+        ))
+        return [cls.from_json(item) for chunk in chunks for item in chunk]
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -323,10 +386,16 @@ class WorkItemQueryResult(BaseModel):
                 "url"#
             ]
             #Falta rev
-        df = pd.DataFrame([item.model_dump() for item in self.workItems])
-        if column_order:
-            df = df[[col for col in column_order if col in df.columns]]
-        return df
+        # Build only the requested columns straight from the attributes: model_dump()
+        # would copy every field of every item (including the raw fields/relations payloads)
+        columns = [col for col in column_order if col in WorkItem.model_fields]
+        data = {}
+        for col in columns:
+            if col == "assignedTo":
+                data[col] = [item.assignedTo.model_dump() if item.assignedTo else None for item in self.workItems]
+            else:
+                data[col] = [getattr(item, col) for item in self.workItems]
+        return pd.DataFrame(data, columns=columns)
     
     @classmethod
     def from_json_list(cls, json_list):
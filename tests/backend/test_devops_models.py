@@ -0,0 +1,68 @@
+"""
+Tests for the Azure DevOps work item models (hierarchy loading).
+"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from backend.models.devops_models import WorkItem
+from backend.models.project_models import EpicProject
+
+
+# Epic 1 -> Features 2, 3 -> Tasks 4, 5 (under 2) and 6 (under 3)
+_TREE = {1: [2, 3], 2: [4, 5], 3: [6], 4: [], 5: [], 6: []}
+
+
+def _relations(work_item_id):
+    relations = [
+        {"rel": "System.LinkTypes.Hierarchy-Forward", "url": f"https://x/_apis/wit/workItems/{child}"}
+        for child in _TREE[work_item_id]
+    ]
+    relations.append({"rel": "System.LinkTypes.Hierarchy-Reverse", "url": "https://x/_apis/wit/workItems/99"})
+    return relations
+
+
+def _fake_session():
+    """Session answering workitemsbatch POSTs from _TREE."""
+    def post(url, headers=None, json=None):
+        response = Mock(status_code=200)
+        response.json.return_value = {"value": [
+            {"id": work_item_id, "relations": _relations(work_item_id)} for work_item_id in json["ids"]
+        ]}
+        return response
+
+    session = MagicMock()
+    session.__enter__.return_value = session
+    session.post.side_effect = post
+    return session
+
+
+def test_get_relationships_builds_tree_from_str_project_id():
+    """Test the root (whose id is the project's str id) gets its whole hierarchy."""
+    project = EpicProject(id="1", name="Delta", root=None)
+    root_response = Mock(status_code=200)
+    root_response.json.return_value = {"id": 1, "fields": {"System.Title": "Delta"}}
+    session = _fake_session()
+
+    with patch("requests.get", return_value=root_response), patch("requests.Session", return_value=session):
+        project.getRelationships(headers={}, azure_path="https://x", azure_project_id="p")
+
+    assert [child.id for child in project.root.childs] == [2, 3]
+    assert [[task.id for task in child.childs] for child in project.root.childs] == [[4, 5], [6]]
+    assert [call.kwargs["json"]["ids"] for call in session.post.call_args_list] == [[1], [2, 3], [4, 5, 6]]
+
+    with patch("requests.Session", return_value=_fake_session()):
+        assert [task.id for task in project.getTasks(headers={})] == [4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_inside_event_loop():
+    """Test the sync getInfo path still works when called from a running event loop."""
+    project = EpicProject(id="1", name="Delta", root=None)
+    project.root = WorkItem.create_with_defaults(1)
+
+    with patch("requests.Session", return_value=_fake_session()):
+        tasks = project.getTasks(headers={})
+
+    assert [task.id for task in tasks] == [4, 5, 6]
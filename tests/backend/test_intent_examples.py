@@ -59,6 +59,38 @@ class TestIntentExamplesRegistry:
         assert filtered[0].prompt == "Prompt 1"
         assert filtered[1].prompt == "Prompt 2"
     
+    def test_iter_all_is_lazy(self):
+        """Test iter_all yields ExamplePrompt objects on demand."""
+        register_examples("intent1", ["Prompt 1", "Prompt 2"])
+        
+        iterator = IntentExamplesRegistry.iter_all("intent1")
+        
+        first = next(iterator)
+        assert isinstance(first, ExamplePrompt)
+        assert first.prompt == "Prompt 1"
+        assert [ex.prompt for ex in iterator] == ["Prompt 2"]
+    
+    def test_get_all_cached_until_register(self):
+        """Test get_all reuses its result until a new category is registered."""
+        register_examples("intent1", ["Prompt 1"])
+        
+        first = IntentExamplesRegistry.get_all()
+        assert IntentExamplesRegistry.get_all() is first
+        
+        register_examples("intent2", ["Prompt 2"])
+        second = IntentExamplesRegistry.get_all()
+        
+        assert second is not first
+        assert len(second) == 2
+    
+    def test_get_all_does_not_cache_unknown_categories(self):
+        """Test unknown category filters return nothing and are not kept in the cache."""
+        register_examples("intent1", ["Prompt 1"])
+        IntentExamplesRegistry.get_all()
+        
+        assert IntentExamplesRegistry.get_all("no_such_intent") == []
+        assert set(IntentExamplesRegistry._cached_all) == {None}
+    
     def test_get_categories(self):
         """Test getting list of categories."""
         register_examples("category1", ["Prompt 1"])
@@ -72,7 +104,7 @@ class TestIntentExamplesRegistry:
 
 
 class TestExamplePrompt:
-    """Tests for ExamplePrompt model."""
+    """Tests for ExamplePrompt."""
     
     def test_example_prompt_creation(self):
         """Test creating ExamplePrompt."""